@@ -1,28 +1,114 @@
 # app.py
-from flask import Flask, request, render_template_string, jsonify, send_from_directory
+from flask import Flask, request, render_template, jsonify, send_from_directory, Response
 import os
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 import json
 import time # For exponential backoff
+import random
+import queue
+import threading
+import re
+import asyncio
+import hashlib
+import unicodedata
+from concurrent.futures import Future, ThreadPoolExecutor
 from dotenv import load_dotenv
 from PIL import Image # Import the Pillow library for image resizing
+from flask.json.provider import DefaultJSONProvider
+from flask_caching import Cache
+from flask_compress import Compress
+from jinja2 import FileSystemBytecodeCache
+
+try:
+    import simdjson # Optional: SIMD-accelerated parser for the large Gemini JSON responses
+except ImportError:
+    simdjson = None
+
+try:
+    import orjson # Optional: faster encoder for the large /generate_website responses
+except ImportError:
+    orjson = None
 
 # Load environment variables from .env file
 load_dotenv()
 
 app = Flask(__name__)
 
+# --- JSON provider backed by orjson, used for jsonify when it is installed ---
+class ORJSONProvider(DefaultJSONProvider):
+    def dumps(self, obj, **kwargs):
+        return orjson.dumps(obj, default=self.default).decode('utf-8')
+
+    def loads(self, s, **kwargs):
+        return orjson.loads(s)
+
+if orjson is not None:
+    app.json = ORJSONProvider(app)
+
+# Compress HTML/JSON responses (Brotli when the browser supports it); SSE streams are left alone
+app.config.update(COMPRESS_ALGORITHM=['br', 'gzip'], COMPRESS_LEVEL=5, COMPRESS_BR_LEVEL=5,
+                  COMPRESS_MIN_SIZE=500, COMPRESS_STREAMS=False)
+Compress(app)
+
+# Compiled templates are kept on disk so each new gunicorn worker skips the Jinja parse;
+# auto-reload stays tied to debug mode, so production never re-checks the template files
+app.jinja_env.bytecode_cache = FileSystemBytecodeCache()
+
 # --- API Keys Configuration ---
 GEMINI_API_KEY = os.getenv("GEMINI_API_KEY", "YOUR_GEMINI_API_KEY_HERE")
 UNSPLASH_ACCESS_KEY = os.getenv("UNSPLASH_ACCESS_KEY", "YOUR_UNSPLASH_ACCESS_KEY_HERE")
 # -----------------------------
 
+# Fail at startup rather than on every request with a 403 after all the retries
+if not GEMINI_API_KEY or GEMINI_API_KEY == "YOUR_GEMINI_API_KEY_HERE":
+    raise RuntimeError("GEMINI_API_KEY is not configured. Set it in the environment or in .env.")
+
+# --- Gemini endpoints and prompts, built once at import ---
+GEMINI_MODEL_URL = "https://generativelanguage.googleapis.com/v1beta/models/gemini-1.5-flash-latest"
+GEMINI_GENERATE_URL = f"{GEMINI_MODEL_URL}:generateContent"
+GEMINI_STREAM_URL = f"{GEMINI_MODEL_URL}:streamGenerateContent?alt=sse"
+# The key goes in a header so it never shows up in logged request URLs
+GEMINI_HEADERS = {"x-goog-api-key": GEMINI_API_KEY}
+
+SUGGEST_PAGES_PROMPT = 'For a website described as "{description}", suggest 4 to 6 essential page names. Examples: Home, About Us, Services, Portfolio, Blog, Contact. Return as a simple comma-separated list. Exclude any numbering or extra text.'
+
 # Directory for storing downloaded images
 BASE_DIR = os.path.abspath(os.path.dirname(__file__))
 IMAGES_DIR = os.path.join(BASE_DIR, 'images')
 if not os.path.exists(IMAGES_DIR):
     os.makedirs(IMAGES_DIR)
 
+# Unsplash photos are hotlinked from their CDN; resolved URLs are cached per query for a week
+UNSPLASH_IMAGE_PARAMS = '&w=1200&auto=format&q=80'
+IMAGE_URL_CACHE_TIMEOUT = 7 * 24 * 60 * 60
+
+# Shared HTTP session so Gemini and Unsplash calls reuse pooled keep-alive connections.
+# urllib3 retries idempotent requests on transient statuses; Gemini POSTs keep api_call_with_backoff.
+RETRYABLE_STATUS_CODES = [429, 500, 502, 503, 504]
+SESSION = requests.Session()
+SESSION.mount('https://', HTTPAdapter(pool_connections=16, pool_maxsize=32, max_retries=Retry(
+    total=3, backoff_factor=0.5, status_forcelist=RETRYABLE_STATUS_CODES, raise_on_status=False)))
+
+# Gemini calls currently in progress, keyed like the response cache
+GEMINI_INFLIGHT = {}
+GEMINI_INFLIGHT_LOCK = threading.Lock()
+
+TOPIC_CACHE_TIMEOUT = 24 * 60 * 60
+
+# Shared, bounded pool for image lookups, so concurrent generations can't open unbounded connections
+IMAGE_EXECUTOR = ThreadPoolExecutor(max_workers=10, thread_name_prefix='image-fetch')
+
+# On-disk cache for Gemini responses and image search results, so repeats skip the API calls.
+# It is shared by all worker processes and capped at 512 entries.
+cache = Cache(app, config={
+    'CACHE_TYPE': 'FileSystemCache',
+    'CACHE_DIR': os.path.join(BASE_DIR, 'gemini_cache'),
+    'CACHE_DEFAULT_TIMEOUT': 86400,
+    'CACHE_THRESHOLD': 512
+})
+
 @app.route('/upload_image', methods=['POST'])
 def upload_image():
     if 'file' not in request.files:
@@ -48,221 +134,201 @@ def upload_image():
 
 
 # --- Helper function for exponential backoff ---
-def api_call_with_backoff(url, headers, payload, max_retries=5, initial_delay=1):
+def api_call_with_backoff(url, headers, payload, max_retries=5, initial_delay=1, max_delay=30):
     for i in range(max_retries):
+        # Truncated exponential backoff with full jitter, so clients don't retry in lockstep
+        delay = random.uniform(0, min(max_delay, initial_delay * (2 ** i)))
         try:
-            response = requests.post(url, headers=headers, data=json.dumps(payload), timeout=300) # Increased timeout
+            response = SESSION.post(url, headers=headers, json=payload, timeout=(10, 300)) # Connect, read timeouts
             if not response.ok:
                 print(f"--- API Error Response ---")
                 print(f"Status Code: {response.status_code}")
-                try: print(f"Response JSON: {response.json()}")
+                try: print(f"Response JSON: {parse_json(response.content)}")
                 except json.JSONDecodeError: print(f"Response Text: {response.text}")
                 print(f"--------------------------")
+                retry_after = response.headers.get('Retry-After')
+                if retry_after and retry_after.isdigit():
+                    delay = min(max_delay, int(retry_after))
             response.raise_for_status()
-            return response.json()
+            return parse_json(response.content) # Parse the raw bytes; skips requests' charset detection
         except requests.exceptions.HTTPError as e:
             print(f"API call failed with HTTPError (retry {i+1}/{max_retries}): {e}")
-            if i >= max_retries - 1: raise
-            time.sleep(initial_delay * (2 ** i))
+            # Client errors (bad prompt, bad key, unknown model) won't succeed on retry
+            if i >= max_retries - 1 or e.response.status_code not in RETRYABLE_STATUS_CODES: raise
+            time.sleep(delay)
         except (requests.exceptions.RequestException, requests.exceptions.Timeout) as e:
             print(f"API call failed with network error (retry {i+1}/{max_retries}): {e}")
             if i >= max_retries - 1: raise
-            time.sleep(initial_delay * (2 ** i))
+            time.sleep(delay)
 
-# --- Helper function to download and resize an image ---
-def download_image(image_url, filename):
-    try:
-        response = requests.get(image_url, stream=True)
+# --- Helper function to stream a Gemini generation, reporting the text received so far ---
+def stream_gemini_text(stream_url, payload, on_text=None):
+    text = ''
+    with SESSION.post(stream_url, headers=GEMINI_HEADERS, json=payload, stream=True, timeout=(10, 300)) as response:
         response.raise_for_status()
-        with Image.open(response.raw) as img:
-            img.thumbnail((1920, 1080), Image.Resampling.LANCZOS)
-            filepath = os.path.join(IMAGES_DIR, filename)
-            img.save(filepath, 'JPEG', quality=85, optimize=True)
-        return os.path.join('images', filename).replace('\\', '/')
-    except Exception as e:
-        print(f"Error during image processing: {e}")
-        return None
+        # Lines stay bytes and json.loads decodes them as UTF-8; requests would assume ISO-8859-1
+        # for a text/event-stream reply that names no charset
+        for line in response.iter_lines():
+            if not line.startswith(b'data: '):
+                continue
+            chunk = json.loads(line[len(b'data: '):])
+            for candidate in chunk.get('candidates', [])[:1]:
+                for part in candidate.get('content', {}).get('parts', []):
+                    text += part.get('text', '')
+            if on_text:
+                on_text(text)
+    if not text:
+        raise ValueError("Gemini stream ended without any text.")
+    return text
+
+# --- Helpers to reuse cached Gemini responses for identical prompts ---
+def gemini_cache_key(api_url, payload):
+    # Key on the model endpoint and the whole request body, so the system
+    # instruction and generation settings are covered. Unicode/case differences in the prompt
+    # text don't produce separate entries.
+    key_source = json.dumps({"endpoint": api_url, "payload": payload}, sort_keys=True, ensure_ascii=False)
+    key_source = unicodedata.normalize('NFC', key_source).casefold()
+    return hashlib.sha256(key_source.encode('utf-8')).hexdigest()
+
+def cached_gemini_text(api_url, payload, stream_url=None, on_text=None):
+    key = gemini_cache_key(api_url, payload)
+    while True:
+        text = cache.get(key)
+        if text is not None:
+            print(f"Using cached Gemini response for prompt {key[:12]}...")
+            return text
+        # Single-flight: concurrent identical requests wait for the first one instead of calling Gemini again
+        with GEMINI_INFLIGHT_LOCK:
+            future = GEMINI_INFLIGHT.get(key)
+            is_leader = future is None
+            if is_leader:
+                future = GEMINI_INFLIGHT[key] = Future()
+        if is_leader:
+            break
+        try:
+            text = future.result(timeout=310)
+        except GenerationCancelled:
+            continue # The first caller's client went away; generate for this one instead
+        if on_text:
+            on_text(text)
+        return text
+
+    try:
+        text = None
+        if stream_url:
+            try:
+                text = stream_gemini_text(stream_url, payload, on_text)
+            except (requests.exceptions.RequestException, ValueError) as e:
+                print(f"Streaming generation failed ({e}), falling back to a regular request.")
+        if text is None:
+            result = api_call_with_backoff(api_url, headers=GEMINI_HEADERS, payload=payload)
+            text = result['candidates'][0]['content']['parts'][0]['text']
+        cache.set(key, text)
+        future.set_result(text)
+        return text
+    except BaseException as e:
+        future.set_exception(e)
+        raise
+    finally:
+        with GEMINI_INFLIGHT_LOCK:
+            GEMINI_INFLIGHT.pop(key, None)
+
+# --- Helper function to key a website topic, ignoring case, spacing and punctuation but not word order ---
+def topic_fingerprint(description):
+    words = re.findall(r'\w+', unicodedata.normalize('NFKC', description).casefold())
+    return hashlib.sha256(' '.join(words).encode('utf-8')).hexdigest()
+
+# --- Helper function to parse JSON text or bytes, using simdjson or orjson when installed ---
+def parse_json(text):
+    if simdjson is not None:
+        try:
+            return simdjson.loads(text)
+        except ValueError:
+            pass # Let the stdlib parser raise a JSONDecodeError the callers know how to handle
+    elif orjson is not None:
+        try:
+            return orjson.loads(text)
+        except orjson.JSONDecodeError:
+            pass
+    return json.loads(text)
+
+# Matches a whole response wrapped in a markdown code fence (```json, ``` or unclosed), capturing the body
+FENCE_RE = re.compile(r'\A\s*```(?:json)?[ \t]*\n?(.*?)(?:\n?```\s*)?\Z', re.DOTALL)
+
+# Matches image elements in (possibly incomplete) generated JSON text, capturing the query
+IMAGE_QUERY_RE = re.compile(r'"type"\s*:\s*"image"\s*,\s*"content"\s*:\s*"((?:[^"\\]|\\.)*)"')
+
+# --- Helper function to yield image nodes by walking only the sections/children lists ---
+def iter_image_nodes(pages):
+    stack = [section for page in reversed(pages) for section in reversed(page.get('sections', []))]
+    while stack:
+        node = stack.pop()
+        if not isinstance(node, dict):
+            continue
+        if node.get('type') == 'image':
+            yield node
+        stack.extend(reversed(node.get('children') or []))
+
+# --- Helper function to resolve an image query to an image URL (cached per query) ---
+def fetch_image_for_query(query):
+    key = f"unsplash:{query}"
+    image_url = cache.get(key)
+    if image_url is not None:
+        return image_url
+    print(f"Fetching image for query '{query}'...")
+    image_url = search_unsplash_image(query)
+    if not image_url:
+        # Placeholders are never cached, so the query is searched again once Unsplash answers
+        return f"https://placehold.co/1280x800/1e293b/e2e8f0?text={query.replace(' ', '+')}"
+    cache.set(key, image_url, timeout=IMAGE_URL_CACHE_TIMEOUT)
+    return image_url
 
 # --- Helper function to search Unsplash ---
 def search_unsplash_image(query):
     if not UNSPLASH_ACCESS_KEY or UNSPLASH_ACCESS_KEY == "YOUR_UNSPLASH_ACCESS_KEY_HERE":
         print("Unsplash API key not configured. Using placeholder.")
-        return f"https://placehold.co/1280x800/1e293b/e2e8f0?text={query.replace(' ', '+')}"
+        return None
     
     url = "https://api.unsplash.com/search/photos"
     params = {"query": query, "per_page": 1, "orientation": "landscape"}
     headers = {"Authorization": f"Client-ID {UNSPLASH_ACCESS_KEY}"}
     try:
-        res = requests.get(url, headers=headers, params=params)
+        res = SESSION.get(url, headers=headers, params=params, timeout=30)
         res.raise_for_status()
         data = res.json()
-        return data['results'][0]['urls']['regular'] if data['results'] else None
+        # Serve the photo straight from Unsplash's CDN, sized and compressed by its image service
+        return data['results'][0]['urls']['raw'] + UNSPLASH_IMAGE_PARAMS if data['results'] else None
     except Exception as e:
         print(f"Error searching Unsplash for query '{query}': {e}")
-        return f"https://placehold.co/1280x800/1e293b/e2e8f0?text={query.replace(' ', '+')}"
+        return None
 
 @app.route('/')
 def index():
-    return render_template_string('''
-        <!DOCTYPE html>
-<html lang="en">
-<head>
-    <meta charset="UTF-8">
-    <meta name="viewport" content="width=device-width, initial-scale=1.0">
-    <title>AI Website Generator</title>
-    <script src="https://cdn.tailwindcss.com"></script>
-    <link href="https://fonts.googleapis.com/css2?family=Inter:wght@400;600;700&display=swap" rel="stylesheet">
-    <style>
-        * { box-sizing: border-box; }
-        body { font-family: 'Inter', sans-serif; background: linear-gradient(135deg, #0f172a 0%, #1e293b 50%, #334155 100%); color: #e2e8f0; min-height: 100vh; margin: 0; padding: 0; overflow-x: hidden; position: relative; display: flex; align-items: center; justify-content: center; }
-        .bg-animation { position: fixed; top: 0; left: 0; width: 100%; height: 100%; pointer-events: none; z-index: 1; will-change: transform; }
-        .floating-orb { position: absolute; border-radius: 50%; background: radial-gradient(circle, rgba(99, 179, 237, 0.4) 0%, rgba(139, 92, 246, 0.2) 70%, transparent 100%); animation: float 8s ease-in-out infinite; will-change: transform; backface-visibility: hidden; }
-        .floating-orb:nth-child(1) { width: clamp(60px, 8vw, 120px); height: clamp(60px, 8vw, 120px); top: 15%; left: 10%; animation-delay: 0s; }
-        .floating-orb:nth-child(2) { width: clamp(40px, 6vw, 80px); height: clamp(40px, 6vw, 80px); top: 60%; right: 15%; animation-delay: 2s; }
-        .floating-orb:nth-child(3) { width: clamp(80px, 10vw, 150px); height: clamp(80px, 10vw, 150px); bottom: 15%; left: 20%; animation-delay: 4s; }
-        .floating-orb:nth-child(4) { width: clamp(30px, 4vw, 60px); height: clamp(30px, 4vw, 60px); top: 30%; right: 30%; animation-delay: 1s; }
-        @keyframes float { 0%, 100% { transform: translateY(0px) translateX(0px) scale(1); opacity: 0.6; } 50% { transform: translateY(-15px) translateX(10px) scale(1.05); opacity: 0.8; } }
-        .grid-pattern { position: fixed; top: 0; left: 0; width: 100%; height: 100%; background-image: linear-gradient(rgba(99, 179, 237, 0.08) 1px, transparent 1px), linear-gradient(90deg, rgba(99, 179, 237, 0.08) 1px, transparent 1px); background-size: clamp(30px, 5vw, 50px) clamp(30px, 5vw, 50px); animation: gridMove 25s linear infinite; z-index: 1; will-change: transform; }
-        @keyframes gridMove { 0% { transform: translate(0, 0); } 100% { transform: translate(50px, 50px); } }
-        .container { max-width: min(90vw, 750px); margin: clamp(20px, 5vh, 50px) auto; padding: clamp(1.5rem, 4vw, 3rem); background: rgba(30, 41, 59, 0.95); backdrop-filter: blur(20px); border: 1px solid rgba(99, 179, 237, 0.3); border-radius: clamp(1rem, 2vw, 1.5rem); box-shadow: 0 25px 50px -12px rgba(0, 0, 0, 0.6), 0 0 0 1px rgba(99, 179, 237, 0.1), inset 0 1px 0 rgba(255, 255, 255, 0.1); position: relative; z-index: 10; transition: transform 0.3s cubic-bezier(0.4, 0, 0.2, 1); display: flex; flex-direction: column; align-items: center; justify-content: center; }
-        @media (hover: hover) { .container:hover { transform: translateY(-3px); } }
-        textarea { width: 100%; padding: clamp(0.75rem, 3vw, 1rem) clamp(1rem, 4vw, 1.5rem); border-radius: clamp(0.5rem, 2vw, 0.75rem); border: 2px solid rgba(71, 85, 105, 0.4); background: rgba(51, 65, 85, 0.9); backdrop-filter: blur(10px); color: #e2e8f0; transition: all 0.3s cubic-bezier(0.4, 0, 0.2, 1); font-size: clamp(1rem, 3vw, 1.1rem); line-height: 1.5; -webkit-appearance: none; appearance: none; min-height: 120px; resize: vertical; }
-        textarea:focus { border-color: #63b3ed; box-shadow: 0 0 0 3px rgba(99, 179, 237, 0.25), 0 8px 25px rgba(99, 179, 237, 0.15); outline: none; transform: translateY(-1px); }
-        button { background: linear-gradient(135deg, #63b3ed, #90cdf4); color: #1a202c; padding: clamp(0.75rem, 3vw, 1rem) clamp(1.5rem, 5vw, 2.5rem); border-radius: clamp(0.75rem, 2vw, 1rem); font-weight: 600; cursor: pointer; border: none; transition: all 0.3s cubic-bezier(0.4, 0, 0.2, 1); font-size: clamp(1rem, 3vw, 1.1rem); position: relative; overflow: hidden; box-shadow: 0 8px 25px rgba(99, 179, 237, 0.3); min-height: 48px; display: inline-flex; align-items: center; justify-content: center; white-space: nowrap; }
-        #submitBtn { width: 320px !important; max-width: 100%; margin: 0 auto; display: block; font-size: 1.15rem; }
-        @media (hover: hover) { button:hover:not(:disabled) { background: linear-gradient(135deg, #90cdf4, #bee3f8); transform: translateY(-2px); box-shadow: 0 12px 35px rgba(99, 179, 237, 0.4); } }
-        button:active:not(:disabled) { transform: translateY(0); transition: transform 0.1s; }
-        button:disabled { background: linear-gradient(135deg, #4a5568, #2d3748); cursor: not-allowed; color: #a0aec0; transform: none; }
-        .loading-spinner { border: 3px solid rgba(99, 179, 237, 0.3); border-top: 3px solid #63b3ed; border-radius: 50%; width: clamp(28px, 5vw, 35px); height: clamp(28px, 5vw, 35px); animation: spin 1s linear infinite; display: none; margin-left: clamp(0.75rem, 3vw, 1.5rem); flex-shrink: 0; }
-        @keyframes spin { to { transform: rotate(360deg); } }
-        .title-glow { background: linear-gradient(135deg, #63b3ed, #a78bfa, #f093fb); background-size: 200% 200%; -webkit-background-clip: text; -webkit-text-fill-color: transparent; background-clip: text; animation: gradientShift 4s ease infinite; font-size: clamp(2rem, 8vw, 3rem); line-height: 1.2; margin-bottom: clamp(1rem, 4vw, 1.5rem); }
-        @keyframes gradientShift { 0%, 100% { background-position: 0% 50%; } 50% { background-position: 100% 50%; } }
-        .form-group { position: relative; margin-bottom: clamp(1.5rem, 4vw, 2rem); }
-        .description-text { font-size: clamp(1rem, 3vw, 1.125rem); line-height: 1.6; margin-bottom: clamp(2rem, 5vw, 2.5rem); }
-        .label-text { font-size: clamp(1rem, 3vw, 1.125rem); margin-bottom: clamp(0.75rem, 2vw, 1rem); }
-        .button-container { display: flex; align-items: center; justify-content: center; flex-wrap: nowrap; gap: clamp(0.75rem, 3vw, 1.5rem); margin-top: clamp(1.5rem, 4vw, 2rem); }
-        .fade-in { animation: fadeIn 0.8s cubic-bezier(0.4, 0, 0.2, 1) forwards; opacity: 0; }
-        @keyframes fadeIn { from { opacity: 0; transform: translateY(20px); } to { opacity: 1; transform: translateY(0); } }
-    </style>
-</head>
-<body>
-    <div class="bg-animation">
-        <div class="grid-pattern"></div>
-        <div class="floating-orb"></div><div class="floating-orb"></div><div class="floating-orb"></div><div class="floating-orb"></div>
-    </div>
-
-    <div class="container text-center fade-in">
-        <h1 class="title-glow font-bold">🌐 AI Website Generator</h1>
-        <p class="description-text text-gray-300">Describe the website you want to create, and let AI build a foundation for you.</p>
-        
-        <form id="descriptionForm" onsubmit="submitDescription(event)" novalidate>
-            <div class="text-left">
-                <label for="description" class="label-text text-gray-200 block font-semibold">Describe your ideal website:</label>
-                <div class="form-group">
-                    <textarea 
-                        id="description" 
-                        name="description" 
-                        placeholder="e.g., A modern portfolio for a photographer named Jane Doe, with a gallery, an about page, and a contact form." 
-                        required
-                        autocomplete="off"
-                        spellcheck="true"
-                    ></textarea>
-                </div>
-            </div>
-            <div class="button-container">
-                <button type="submit" id="submitBtn" aria-describedby="loading-status">
-                    Plan Website Pages
-                </button>
-                <div id="loadingSpinner" class="loading-spinner" role="status" aria-label="Loading"></div>
-            </div>
-            <div id="loading-status" class="sr-only" aria-live="polite"></div>
-        </form>
-    </div>
-
-    <script>
-        function validateInput(description) {
-            if (!description || description.trim().length < 10) {
-                return 'Please provide a more detailed description (at least 10 characters).';
-            }
-            if (description.trim().length > 1000) {
-                return 'Description is too long. Please keep it under 1000 characters.';
-            }
-            return null;
-        }
-
-        async function submitDescription(event) {
-            event.preventDefault();
-            
-            const btn = document.getElementById('submitBtn');
-            const spinner = document.getElementById('loadingSpinner');
-            const description = document.getElementById('description').value;
-            const statusElement = document.getElementById('loading-status');
-            
-            const validationError = validateInput(description);
-            if (validationError) {
-                alert(validationError);
-                return;
-            }
-            
-            btn.disabled = true;
-            btn.innerHTML = 'Planning...';
-            spinner.style.display = 'inline-block';
-            statusElement.textContent = 'Generating website page ideas...';
-            
-            try {
-                const res = await fetch('/suggest_pages', {
-                    method: 'POST',
-                    headers: { 'Content-Type': 'application/json' },
-                    body: JSON.stringify({ description: description.trim() })
-                });
-                
-                if (!res.ok) {
-                    const err = await res.json();
-                    throw new Error(err.error?.message || `Server error: ${res.status}`);
-                }
-                
-                const data = await res.json();
-                
-                if (!data.pages || !Array.isArray(data.pages)) {
-                    throw new Error('Invalid response format from server.');
-                }
-
-                sessionStorage.setItem('websiteDescription', description.trim());
-                sessionStorage.setItem('websitePages', JSON.stringify(data.pages));
-                
-                window.location.href = `/manage_pages`;
-                
-            } catch (error) {
-                console.error('Submission error:', error);
-                alert('Failed to generate page ideas. ' + error.message);
-                
-                btn.disabled = false;
-                btn.innerHTML = '✨ Plan Website Pages';
-                spinner.style.display = 'none';
-                statusElement.textContent = '';
-            }
-        }
-    </script>
-</body>
-</html>''')
+    return render_template('website/index.html')
 
 @app.route('/suggest_pages', methods=['POST'])
-def suggest_pages():
+async def suggest_pages():
     data = request.get_json()
-    if not (description := data.get('description')): 
+    if not (description := (data.get('description') or '').strip()): 
         return jsonify({"error": "No description provided"}), 400
     
-    prompt = f'For a website described as "{description}", suggest 4 to 6 essential page names. Examples: Home, About Us, Services, Portfolio, Blog, Contact. Return as a simple comma-separated list. Exclude any numbering or extra text.'
-    api_url = f"https://generativelanguage.googleapis.com/v1beta/models/gemini-1.5-flash-latest:generateContent?key={GEMINI_API_KEY}"
+    # The same topic, however it is cased or spaced, shares one suggestion, so look it up before asking Gemini
+    topic_key = f"pages:{topic_fingerprint(description)}"
+    if (cached_pages := cache.get(topic_key)) is not None:
+        return jsonify({"pages": cached_pages})
+
+    prompt = SUGGEST_PAGES_PROMPT.format(description=description)
+    api_url = GEMINI_GENERATE_URL
     payload = {"contents": [{"parts": [{"text": prompt}]}], "generationConfig": {"temperature": 0.5}}
     
     try:
-        result = api_call_with_backoff(api_url, {'Content-Type': 'application/json'}, payload)
-        text_response = result['candidates'][0]['content']['parts'][0]['text']
+        text_response = await asyncio.to_thread(cached_gemini_text, api_url, payload)
         pages = [p.strip() for p in text_response.strip().split(',') if p.strip()]
         
         if not pages or len(pages) < 2:
             pages = ["Home", "About", "Contact"]
+        else:
+            cache.set(topic_key, pages[:8], timeout=TOPIC_CACHE_TIMEOUT)
             
         return jsonify({"pages": pages[:8]})
     except Exception as e:
@@ -270,256 +336,133 @@ def suggest_pages():
 
 @app.route('/manage_pages')
 def manage_pages():
-    return render_template_string('''
-        <!DOCTYPE html>
-<html lang="en">
-<head>
-    <meta charset="UTF-8">
-    <meta name="viewport" content="width=device-width, initial-scale=1.0">
-    <title>Manage Website Pages</title>
-    <script src="https://cdn.tailwindcss.com"></script>
-    <link href="https://fonts.googleapis.com/css2?family=Inter:wght@400;600;700&display=swap" rel="stylesheet">
-    <style>
-        * { box-sizing: border-box; }
-        body { font-family: 'Inter', sans-serif; background: linear-gradient(135deg, #0f172a 0%, #1e293b 50%, #334155 100%); color: #e2e8f0; min-height: 100vh; margin: 0; padding: 0; overflow-x: hidden; position: relative; }
-        .bg-animation { position: fixed; top: 0; left: 0; width: 100%; height: 100%; pointer-events: none; z-index: 1; will-change: transform; }
-        .floating-orb { position: absolute; border-radius: 50%; background: radial-gradient(circle, rgba(99, 179, 237, 0.4) 0%, rgba(139, 92, 246, 0.2) 70%, transparent 100%); animation: float 8s ease-in-out infinite; will-change: transform; backface-visibility: hidden; }
-        .floating-orb:nth-child(1) { width: clamp(60px, 8vw, 120px); height: clamp(60px, 8vw, 120px); top: 15%; left: 10%; animation-delay: 0s; }
-        .floating-orb:nth-child(2) { width: clamp(40px, 6vw, 80px); height: clamp(40px, 6vw, 80px); top: 60%; right: 15%; animation-delay: 2s; }
-        .main-container { max-width: min(90vw, 800px); margin: clamp(20px, 5vh, 50px) auto; padding: clamp(1.5rem, 4vw, 2.5rem); background: rgba(30, 41, 59, 0.95); backdrop-filter: blur(20px); border: 1px solid rgba(99, 179, 237, 0.3); border-radius: clamp(1rem, 2vw, 1.5rem); box-shadow: 0 25px 50px -12px rgba(0, 0, 0, 0.6), 0 0 0 1px rgba(99, 179, 237, 0.1), inset 0 1px 0 rgba(255, 255, 255, 0.1); position: relative; z-index: 10; transition: transform 0.3s cubic-bezier(0.4, 0, 0.2, 1); }
-        .title-glow { background: linear-gradient(135deg, #63b3ed, #a78bfa, #f093fb); background-size: 200% 200%; -webkit-background-clip: text; -webkit-text-fill-color: transparent; background-clip: text; animation: gradientShift 4s ease infinite; font-size: clamp(1.5rem, 5vw, 2rem); line-height: 1.2; margin-bottom: clamp(1rem, 3vw, 1.5rem); }
-        @keyframes gradientShift { 0%, 100% { background-position: 0% 50%; } 50% { background-position: 100% 50%; } }
-        .subtitle { font-size: clamp(0.875rem, 2.5vw, 1rem); line-height: 1.6; margin-bottom: clamp(1.5rem, 4vw, 2rem); color: #94a3b8; }
-        #pageList li { display: flex; align-items: center; padding: clamp(0.75rem, 3vw, 1rem); margin: clamp(0.5rem, 2vw, 0.75rem) 0; border-radius: clamp(0.5rem, 2vw, 0.75rem); background: rgba(51, 65, 85, 0.8); backdrop-filter: blur(10px); border: 1px solid rgba(71, 85, 105, 0.4); box-shadow: 0 4px 15px rgba(0, 0, 0, 0.2); cursor: grab; transition: all 0.3s cubic-bezier(0.4, 0, 0.2, 1); position: relative; overflow: hidden; }
-        #pageList li.opacity-50 { opacity: 0.5; }
-        #pageList li input { background: transparent; flex-grow: 1; outline: none; width: 100%; color: #e2e8f0; font-size: clamp(0.875rem, 2.5vw, 1rem); border: none; padding: clamp(0.25rem, 1vw, 0.5rem); }
-        #pageList li button { background: linear-gradient(135deg, #ef4444, #dc2626); color: white; font-weight: bold; width: clamp(1.75rem, 4vw, 2rem); height: clamp(1.75rem, 4vw, 2rem); border-radius: 50%; margin-left: clamp(0.75rem, 3vw, 1rem); border: none; cursor: pointer; transition: all 0.3s cubic-bezier(0.4, 0, 0.2, 1); display: flex; align-items: center; justify-content: center; }
-        .add-section { display: flex; align-items: center; gap: clamp(0.75rem, 3vw, 1rem); margin-top: clamp(1.5rem, 4vw, 2rem); flex-wrap: wrap; }
-        #newPageInput { flex-grow: 1; min-width: 200px; background: rgba(51, 65, 85, 0.9); padding: clamp(0.75rem, 3vw, 1rem); border-radius: clamp(0.5rem, 2vw, 0.75rem); border: 2px solid rgba(71, 85, 105, 0.4); color: #e2e8f0; font-size: clamp(0.875rem, 2.5vw, 1rem); transition: all 0.3s cubic-bezier(0.4, 0, 0.2, 1); outline: none; }
-        .add-button { background: linear-gradient(135deg, #10b981, #059669); color: white; font-weight: 600; padding: clamp(0.75rem, 3vw, 1rem) clamp(1.25rem, 4vw, 1.5rem); border-radius: clamp(0.5rem, 2vw, 0.75rem); border: none; cursor: pointer; transition: all 0.3s cubic-bezier(0.4, 0, 0.2, 1); font-size: clamp(0.875rem, 2.5vw, 1rem); }
-        .final-button-section { text-align: center; margin-top: clamp(2rem, 6vw, 3rem); }
-        #generateFinalBtn { background: linear-gradient(135deg, #2563eb, #1d4ed8); color: white; font-weight: bold; padding: clamp(0.75rem, 3vw, 1rem) clamp(1.5rem, 5vw, 2rem); border-radius: clamp(0.75rem, 2vw, 1rem); border: none; cursor: pointer; transition: all 0.3s cubic-bezier(0.4, 0, 0.2, 1); font-size: clamp(1rem, 3vw, 1.125rem); }
-        #loadingSpinner { border: 4px solid rgba(37, 99, 235, 0.3); border-top: 4px solid #2563eb; border-radius: 50%; width: clamp(28px, 5vw, 32px); height: clamp(28px, 5vw, 32px); animation: spin 1s linear infinite; margin: clamp(1rem, 3vw, 1.5rem) auto 0; filter: drop-shadow(0 0 10px rgba(37, 99, 235, 0.5)); }
-        @keyframes spin { to { transform: rotate(360deg); } }
-        .fade-in { animation: fadeIn 0.8s cubic-bezier(0.4, 0, 0.2, 1) forwards; opacity: 0; }
-        @keyframes fadeIn { from { opacity: 0; transform: translateY(20px); } to { opacity: 1; transform: translateY(0); } }
-    </style>
-</head>
-<body class="p-4 md:p-8">
-    <div class="bg-animation">
-        <div class="floating-orb"></div><div class="floating-orb"></div>
-    </div>
-
-    <div class="main-container fade-in">
-        <h1 class="title-glow font-bold text-center">✏️ Review Your Website Pages</h1>
-        <p class="text-center subtitle">Drag to reorder, edit, add, or delete pages. This will define your website's navigation and structure.</p>
-        
-        <ul id="pageList" class="mb-6 space-y-3"></ul>
-        
-        <div class="add-section">
-            <input type="text" id="newPageInput" placeholder="Add a new page name" autocomplete="off">
-            <button onclick="addPage()" class="add-button">Add Page</button>
-        </div>
-        
-        <div class="final-button-section">
-            <button id="generateFinalBtn" onclick="generateFinalWebsite()">🚀 Build My Website</button>
-            <div id="loadingSpinner" style="display:none;"></div>
-        </div>
-    </div>
-
-    <script>
-        let pages = [];
-        let description = '';
-        const list = document.getElementById('pageList');
-
-        document.addEventListener('DOMContentLoaded', () => {
-            description = sessionStorage.getItem('websiteDescription');
-            const storedPages = sessionStorage.getItem('websitePages');
-            if (!description || !storedPages) {
-                alert("No website data found. Please start over.");
-                window.location.href = '/';
-                return;
-            }
-            pages = JSON.parse(storedPages);
-            renderPages();
-        });
-        
-        function renderPages() {
-            list.innerHTML = pages.map((page, i) => `
-                <li class="flex items-center p-3 my-2 rounded-lg bg-slate-700 shadow-md cursor-grab" draggable="true" data-index="${i}">
-                    <span class="text-slate-400 mr-4 font-bold">${i + 1}.</span>
-                    <input value="${page.replace(/"/g, '&quot;')}" onchange="updatePage(${i}, this.value)" class="bg-transparent flex-grow focus:outline-none w-full">
-                    <button onclick="deletePage(${i})" class="bg-red-500 text-white font-bold w-8 h-8 rounded-full ml-4 hover:bg-red-600 transition-colors">X</button>
-                </li>`).join('');
-            addDragAndDropHandlers();
-        }
-        
-        function updatePage(index, value) { pages[index] = value; }
-        function deletePage(index) { pages.splice(index, 1); renderPages(); }
-        function addPage() { 
-            const input = document.getElementById('newPageInput'); 
-            if (input.value.trim()) { pages.push(input.value.trim()); input.value = ''; renderPages(); } 
-        }
-
-        function addDragAndDropHandlers() {
-            let draggedItem = null;
-            list.querySelectorAll('li').forEach(item => {
-                item.addEventListener('dragstart', (e) => {
-                    draggedItem = e.target;
-                    setTimeout(() => e.target.classList.add('opacity-50'), 0);
-                });
-                item.addEventListener('dragend', (e) => {
-                    e.target.classList.remove('opacity-50');
-                    const newPages = Array.from(list.querySelectorAll('li')).map(li => li.querySelector('input').value);
-                    pages = newPages;
-                    renderPages();
-                });
-                item.addEventListener('dragover', (e) => {
-                    e.preventDefault();
-                    const afterElement = getDragAfterElement(list, e.clientY);
-                    list.insertBefore(draggedItem, afterElement);
-                });
-            });
-        }
-        
-        function getDragAfterElement(container, y) {
-            const draggableElements = [...container.querySelectorAll('li:not(.opacity-50)')];
-            return draggableElements.reduce((closest, child) => {
-                const box = child.getBoundingClientRect();
-                const offset = y - box.top - box.height / 2;
-                if (offset < 0 && offset > closest.offset) { return { offset: offset, element: child }; } 
-                else { return closest; }
-            }, { offset: Number.NEGATIVE_INFINITY }).element;
-        }
-
-        async function generateFinalWebsite() {
-            const btn = document.getElementById('generateFinalBtn');
-            const spinner = document.getElementById('loadingSpinner');
-            btn.style.display = 'none';
-            spinner.style.display = 'block';
-            
-            try { 
-                const res = await fetch('/generate_website', { 
-                    method: 'POST', 
-                    headers: {'Content-Type': 'application/json'}, 
-                    body: JSON.stringify({ description: description, pages: pages }) 
-                }); 
-                
-                if (!res.ok) {
-                    const errorData = await res.json();
-                    throw new Error(errorData.error || 'Server error generating website.');
-                }
-                
-                const websiteData = await res.json();
-                localStorage.setItem('websiteData', JSON.stringify(websiteData));
-                window.location.href = '/preview';
-
-            } catch (err) { 
-                alert('Failed to generate website: ' + err.message); 
-                btn.style.display = 'block'; 
-                spinner.style.display = 'none'; 
-            }
-        }
-    </script>
-</body>
-</html>''')
+    return render_template('website/manage_pages.html')
 
 @app.route('/images/<path:filename>')
 def serve_image(filename):
     return send_from_directory(IMAGES_DIR, filename)
 
-@app.route('/generate_website', methods=['POST'])
-def generate_website():
-    data = request.get_json()
-    description, pages = data.get('description'), data.get('pages', [])
-    if not description or not pages: 
-        return jsonify({"error": "Invalid request data"}), 400
-
-    prompt = f"""
-    You are an expert web designer using a **responsive, hierarchical component structure**. Your task is to generate a JSON object representing a beautiful, modern website.
-
-    **CRITICAL RULE:** Do NOT use `position: "absolute"`. All layouts must be responsive using Flexbox or Grid.
-
-    **Website Description:** "{description}"
-    **Pages to Create:** {', '.join(pages)}
-
-    **JSON Structure:**
-    {{
-      "globalStyles": {{
-        "fontFamily": "'Poppins', sans-serif",
-        "backgroundColor": "#0b1120", "textColor": "#d1d5db",
-        "primaryColor": "#818cf8", "secondaryColor": "#1f2937", "accentColor": "#38bdf8"
-      }},
-      "pages": [ /* One object for each page */ ]
-    }}
-
-    **For each page object in "pages":**
-    {{
-      "id": "page-home", "name": "Home",
-      "styles": {{
-        "backgroundColor": "var(--background-color)",
-        "backgroundImage": "radial-gradient(circle at top right, rgba(124, 58, 237, 0.1), transparent 40%)"
-      }},
-      "sections": [ /* One or more section objects */ ]
-    }}
-
-    **For each section object in "sections":**
-    {{
-        "id": "sec-hero", "type": "section",
-        "styles": {{ "display": "flex", "flexDirection": "column", "alignItems": "center", "justifyContent": "center", "padding": "8rem 2rem", "minHeight": "100vh" }},
-        "children": [ /* One or more column objects */ ]
-    }}
-
-    **For each column object in "children":**
-    {{
-        "id": "col-hero-content", "type": "column",
-        "styles": {{ "display": "flex", "flexDirection": "column", "alignItems": "center", "gap": "1.5rem", "textAlign": "center" }},
-        "children": [ /* Array of element objects */ ]
-    }}
-
-    **For each element object in "children" (of a column):**
-    {{
-      "id": "el-hero-title",
-      "type": "heading", // "heading", "text", "button", or "image"
-      "content": "...", // Text content, or Unsplash search query for images.
-      "styles": {{
-        "color": "var(--text-color)", "fontSize": "4rem", "fontWeight": "700",
-        "background": "linear-gradient(90deg, var(--accent-color), var(--primary-color))", "-webkit-background-clip": "text", "-webkit-text-fill-color": "transparent"
-      }}
-    }}
-
-    **DESIGN & LAYOUT GUIDELINES:**
-    1.  **Aesthetics First:** Create a stunning, high-end design. Use `Poppins` font. Use gradient text for main headings. Use glassmorphism for the nav bar.
-    2.  **Responsive Layout:**
-        * For sections with multiple columns of content (like an "About" page with text and an image), use a responsive grid: `{{ "display": "grid", "gridTemplateColumns": "1fr", "md:gridTemplateColumns": "1fr 1fr", "gap": "4rem", "alignItems": "center" }}`.
-        * All sections should be centered and have significant padding.
-    3.  **Professional Content:** Write engaging, relevant copy. No "lorem ipsum".
-    4.  **Buttons:** Style buttons with a gradient background and a hover effect: `"background": "linear-gradient(90deg, var(--primary-color), var(--accent-color))", "transition": "transform 0.2s", "hover:transform": "scale(1.05)"`.
-    5.  **Images:** `content` MUST be a creative Unsplash query. Add `borderRadius` and `boxShadow`.
-    6.  **Full Pages:** Each page should feel complete with at least one well-designed section. The Home page should have a hero section and maybe one other section.
-
-    Return ONLY the raw, perfectly formatted JSON.
-    """
-    
-    api_url = f"https://generativelanguage.googleapis.com/v1beta/models/gemini-1.5-flash-latest:generateContent?key={GEMINI_API_KEY}"
+# Per-request part of the website generation prompt
+WEBSITE_PROMPT = """
+**Website Description:** "{description}"
+**Pages to Create:** {pages}
+"""
+
+# Page list used when the user skips reviewing the suggested pages
+MODEL_CHOSEN_PAGES = "Choose 4 to 6 essential pages for this website yourself (e.g. Home, About Us, Services, Contact)"
+
+# Static part of the website generation prompt, built once and sent as the system instruction
+WEBSITE_SYSTEM_PROMPT = """
+You are an expert web designer using a **responsive, hierarchical component structure**. Your task is to generate a JSON object representing a beautiful, modern website.
+
+**CRITICAL RULE:** Do NOT use `position: "absolute"`. All layouts must be responsive using Flexbox or Grid.
+
+**JSON Structure:**
+{
+  "globalStyles": {
+    "fontFamily": "'Poppins', sans-serif",
+    "backgroundColor": "#0b1120", "textColor": "#d1d5db",
+    "primaryColor": "#818cf8", "secondaryColor": "#1f2937", "accentColor": "#38bdf8"
+  },
+  "pages": [ /* One object for each page */ ]
+}
+
+**For each page object in "pages":**
+{
+  "id": "page-home", "name": "Home",
+  "styles": {
+    "backgroundColor": "var(--background-color)",
+    "backgroundImage": "radial-gradient(circle at top right, rgba(124, 58, 237, 0.1), transparent 40%)"
+  },
+  "sections": [ /* One or more section objects */ ]
+}
+
+**For each section object in "sections":**
+{
+    "id": "sec-hero", "type": "section",
+    "styles": { "display": "flex", "flexDirection": "column", "alignItems": "center", "justifyContent": "center", "padding": "8rem 2rem", "minHeight": "100vh" },
+    "children": [ /* One or more column objects */ ]
+}
+
+**For each column object in "children":**
+{
+    "id": "col-hero-content", "type": "column",
+    "styles": { "display": "flex", "flexDirection": "column", "alignItems": "center", "gap": "1.5rem", "textAlign": "center" },
+    "children": [ /* Array of element objects */ ]
+}
+
+**For each element object in "children" (of a column):**
+{
+  "id": "el-hero-title",
+  "type": "heading", // "heading", "text", "button", or "image"
+  "content": "...", // Text content, or Unsplash search query for images.
+  "styles": {
+    "color": "var(--text-color)", "fontSize": "4rem", "fontWeight": "700",
+    "background": "linear-gradient(90deg, var(--accent-color), var(--primary-color))", "-webkit-background-clip": "text", "-webkit-text-fill-color": "transparent"
+  }
+}
+
+**DESIGN & LAYOUT GUIDELINES:**
+1.  **Aesthetics First:** Create a stunning, high-end design. Use `Poppins` font. Use gradient text for main headings. Use glassmorphism for the nav bar.
+2.  **Responsive Layout:**
+    * For sections with multiple columns of content (like an "About" page with text and an image), use a responsive grid: `{ "display": "grid", "gridTemplateColumns": "1fr", "md:gridTemplateColumns": "1fr 1fr", "gap": "4rem", "alignItems": "center" }`.
+    * All sections should be centered and have significant padding.
+3.  **Professional Content:** Write engaging, relevant copy. No "lorem ipsum".
+4.  **Buttons:** Style buttons with a gradient background and a hover effect: `"background": "linear-gradient(90deg, var(--primary-color), var(--accent-color))", "transition": "transform 0.2s", "hover:transform": "scale(1.05)"`.
+5.  **Images:** `content` MUST be a creative Unsplash query. Add `borderRadius` and `boxShadow`.
+6.  **Full Pages:** Each page should feel complete with at least one well-designed section. The Home page should have a hero section and maybe one other section.
+
+Return ONLY the raw, perfectly formatted JSON.
+"""
+
+# --- Helper function running the whole generation pipeline; on_progress(event, data) gets status updates ---
+async def build_website(description, pages, on_progress=None):
+    prompt = WEBSITE_PROMPT.format(description=description, pages=', '.join(pages) or MODEL_CHOSEN_PAGES)
+    api_url, stream_url = GEMINI_GENERATE_URL, GEMINI_STREAM_URL
     payload = {
+        "systemInstruction": {"parts": [{"text": WEBSITE_SYSTEM_PROMPT}]},
         "contents": [{"parts": [{"text": prompt}]}],
         "generationConfig": {"temperature": 0.8, "responseMimeType": "application/json"}
     }
+
+    # Start fetching images as soon as their queries appear in the streamed JSON,
+    # so downloads overlap with the rest of the generation
+    loop = asyncio.get_running_loop()
+    prefetched = {}
+    seen_queries = set()
+    scan_pos = 0
+
+    def start_prefetch(query):
+        if query not in prefetched:
+            prefetched[query] = loop.run_in_executor(IMAGE_EXECUTOR, fetch_image_for_query, query)
+
+    def on_text(text):
+        nonlocal scan_pos
+        # Only the text after the last match is scanned again
+        for match in IMAGE_QUERY_RE.finditer(text, scan_pos):
+            scan_pos = match.end()
+            try:
+                query = json.loads(f'"{match.group(1)}"')
+            except json.JSONDecodeError:
+                continue
+            if query and query not in seen_queries:
+                seen_queries.add(query)
+                loop.call_soon_threadsafe(start_prefetch, query)
+        # Resume at the last "type" key, which may still be completed by the next chunk, or just
+        # before the end in case the key itself was cut off
+        tail = text.rfind('"type"', scan_pos)
+        scan_pos = tail if tail != -1 else max(scan_pos, len(text) - len('"type"'))
+        if on_progress:
+            on_progress('progress', {"stage": "generating", "chars": len(text)})
     
     try:
-        result = api_call_with_backoff(api_url, headers={'Content-Type': 'application/json'}, payload=payload)
-        response_text = result['candidates'][0]['content']['parts'][0]['text']
+        response_text = await asyncio.to_thread(cached_gemini_text, api_url, payload, stream_url, on_text)
         
-        cleaned_text = response_text.strip()
-        if cleaned_text.startswith("```json"):
-            cleaned_text = cleaned_text[7:]
-        if cleaned_text.endswith("```"):
-            cleaned_text = cleaned_text[:-3]
-        cleaned_text = cleaned_text.strip()
+        fenced = FENCE_RE.match(response_text)
+        cleaned_text = (fenced.group(1) if fenced else response_text).strip()
 
         try:
-            website_data = json.loads(cleaned_text)
+            website_data = parse_json(cleaned_text)
         except json.JSONDecodeError as e:
             print(f"Initial JSON parsing failed: {e}. Attempting recovery.")
             if "Extra data" in str(e):
@@ -537,472 +480,103 @@ def generate_website():
         if 'pages' not in website_data or 'globalStyles' not in website_data:
             raise ValueError("Generated JSON is missing required 'pages' or 'globalStyles' keys.")
 
-        def traverse_and_process_images(node):
-            if isinstance(node, dict):
-                if node.get('type') == 'image':
-                    query = node.get('content')
-                    if query:
-                        print(f"Fetching image for query '{query}'...")
-                        image_url = search_unsplash_image(query)
-                        if image_url:
-                            filename = f"{node['id']}.jpg"
-                            local_path = download_image(image_url, filename)
-                            node['src'] = local_path
-                        else:
-                            node['src'] = f"https://placehold.co/600x400/1e293b/e2e8f0?text=Not+Found"
-                for key, value in node.items():
-                    traverse_and_process_images(value)
-            elif isinstance(node, list):
-                for item in node:
-                    traverse_and_process_images(item)
-
-        traverse_and_process_images(website_data['pages'])
-
-        return jsonify(website_data)
+        # Group image nodes by query so each distinct image is fetched once, reusing prefetches
+        image_nodes = {}
+        for node in iter_image_nodes(website_data['pages']):
+            if node.get('content'):
+                image_nodes.setdefault(node['content'], []).append(node)
+        for query in image_nodes:
+            start_prefetch(query)
+        if on_progress:
+            on_progress('progress', {"stage": "images", "count": len(image_nodes)})
+        queries = list(prefetched)
+        sources = dict(zip(queries, await asyncio.gather(*(prefetched[query] for query in queries))))
+        for query, nodes in image_nodes.items():
+            for node in nodes:
+                node['src'] = sources[query]
+
+        return website_data
+
+    except GenerationCancelled:
+        raise # The cached response is fine; only the client went away
+    except Exception:
+        cache.delete(gemini_cache_key(api_url, payload)) # Don't keep serving a response we couldn't use
+        raise
+
+# Raised from a progress callback to abort a generation nobody is waiting for any more
+class GenerationCancelled(Exception):
+    pass
+
+# --- Helper generator streaming build_website progress as Server-Sent Events ---
+def website_event_stream(description, pages):
+    events = queue.Queue()
+    cancelled = threading.Event()
+
+    def on_progress(event, data):
+        # Runs on the pipeline's threads; raising here unwinds the Gemini stream and closes it
+        if cancelled.is_set():
+            raise GenerationCancelled()
+        events.put((event, data))
+
+    def run_pipeline():
+        try:
+            website_data = asyncio.run(build_website(description, pages, on_progress))
+            events.put(('done', website_data))
+        except GenerationCancelled:
+            print("Client disconnected, website generation cancelled.")
+        except Exception as e:
+            print(f"Error during website generation: {e}")
+            events.put(('error', {"error": f"Failed to generate website content: {e}"}))
+
+    threading.Thread(target=run_pipeline, daemon=True).start()
+    try:
+        while True:
+            event, data = events.get()
+            yield f"event: {event}\ndata: {json.dumps(data)}\n\n"
+            if event in ('done', 'error'):
+                break
+    finally:
+        # The server closes this generator when the client goes away mid-stream
+        cancelled.set()
+
+# --- Helper returning a generated site, as an SSE progress stream or plain JSON ---
+async def website_response(description, pages):
+    # Clients that accept SSE get progress while the site is generated; others get plain JSON
+    if 'text/event-stream' in request.headers.get('Accept', ''):
+        return Response(website_event_stream(description, pages), mimetype='text/event-stream',
+                        headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'})
 
+    try:
+        return jsonify(await build_website(description, pages))
     except Exception as e:
         print(f"Error during website generation: {e}")
         return jsonify({"error": f"Failed to generate website content: {e}"}), 500
 
+@app.route('/generate_website', methods=['POST'])
+async def generate_website():
+    data = request.get_json()
+    description = (data.get('description') or '').strip()
+    pages = [page.strip() for page in data.get('pages', []) if page.strip()]
+    if not description or not pages: 
+        return jsonify({"error": "Invalid request data"}), 400
+
+    return await website_response(description, pages)
+
+# Builds the site in one Gemini call, letting the model pick the pages instead of a separate /suggest_pages step
+@app.route('/quick_generate', methods=['POST'])
+async def quick_generate():
+    data = request.get_json()
+    if not (description := (data.get('description') or '').strip()):
+        return jsonify({"error": "No description provided"}), 400
+
+    return await website_response(description, [])
+
 
 @app.route('/preview')
 def preview():
-    return render_template_string('''
-<!DOCTYPE html>
-<html lang="en">
-<head>
-    <meta charset="UTF-8">
-    <meta name="viewport" content="width=device-width, initial-scale=1.0">
-    <title>AI Website Editor</title>
-    <script src="https://cdn.tailwindcss.com"></script>
-    <script src="https://cdn.jsdelivr.net/npm/interactjs/dist/interact.min.js"></script>
-    <link rel="preconnect" href="https://fonts.googleapis.com">
-    <link rel="preconnect" href="https://fonts.gstatic.com" crossorigin>
-    <link href="https://fonts.googleapis.com/css2?family=Inter:wght@400;700&family=Poppins:wght@400;700&family=Roboto:wght@400;700&family=Lora:wght@400;700&family=Playfair+Display:wght@400;700&display=swap" rel="stylesheet">
-    <style>
-        body { font-family: 'Inter', sans-serif; background-color: #0f172a; color: #e2e8f0; }
-        .editor-container { display: grid; grid-template-columns: 1fr 350px; height: 100vh; }
-        .main-canvas { display: flex; flex-direction: column; background-color: #1e293b; }
-        .properties-panel { background-color: #0f172a; padding: 1rem; overflow-y: auto; border-left: 1px solid #334155; }
-        .top-toolbar { background-color: #1e293b; padding: 0.5rem 1rem; border-bottom: 1px solid #334155; flex-shrink: 0; }
-        .iframe-wrapper { flex-grow: 1; padding: 1rem; }
-        #editor-frame { width: 100%; height: 100%; border: none; background-color: white; border-radius: 0.5rem; transition: all 0.3s ease; }
-        .panel-section details { margin-bottom: 1rem; }
-        .panel-section summary { font-weight: 600; color: #94a3b8; margin-bottom: 0.75rem; border-bottom: 1px solid #334155; padding-bottom: 0.5rem; cursor: pointer; }
-        .prop-grid { display: grid; grid-template-columns: repeat(2, 1fr); gap: 0.75rem; }
-        .prop-label { font-size: 0.875rem; color: #cbd5e1; margin-bottom: 0.25rem; display: block; }
-        .prop-input, .prop-select { width: 100%; background-color: #1e293b; border: 1px solid #475569; color: white; border-radius: 0.375rem; padding: 0.5rem; font-size: 0.875rem; }
-        .prop-input[type="color"] { padding: 0.125rem; height: 38px; }
-        .selected-in-frame { outline: 3px solid #38bdf8 !important; outline-offset: 2px; box-shadow: 0 0 20px rgba(56, 189, 248, 0.5); }
-        .page-tab { background-color: #334155; color: #cbd5e1; padding: 0.25rem 0.75rem; border-radius: 0.375rem; cursor: pointer; transition: all 0.2s ease; }
-        .page-tab:hover { background-color: #475569; }
-        .page-tab.active { background-color: #4f46e5; color: white; font-weight: 600; }
-    </style>
-</head>
-<body>
-    <div class="editor-container">
-        <!-- Main Canvas & Toolbar -->
-        <div class="main-canvas">
-            <div class="top-toolbar flex items-center justify-between">
-                <div id="page-tabs" class="flex items-center gap-2">
-                    <!-- Page tabs will be inserted here -->
-                </div>
-                <div class="flex items-center gap-3">
-                     <button id="addTextBtn" class="bg-blue-600 text-white text-sm font-semibold py-1 px-3 rounded-md hover:bg-blue-700 flex items-center gap-1">
-                        <svg xmlns="http://www.w3.org/2000/svg" width="16" height="16" fill="currentColor" viewBox="0 0 16 16"><path d="M4.5 13.5A.5.5 0 0 1 4 13V2.5A.5.5 0 0 1 4.5 2h7a.5.5 0 0 1 0 1h-7v10h7a.5.5 0 0 1 0 1z"/><path d="M7 5.5a.5.5 0 0 0 .5.5h1a.5.5 0 0 0 0-1h-1a.5.5 0 0 0-.5.5M8 8a.5.5 0 0 1-.5-.5V6a.5.5 0 0 1 1 0v1.5A.5.5 0 0 1 8 8"/></svg>
-                        Text
-                    </button>
-                    <button id="addImageBtn" class="bg-green-600 text-white text-sm font-semibold py-1 px-3 rounded-md hover:bg-green-700 flex items-center gap-1">
-                       <svg xmlns="http://www.w3.org/2000/svg" width="16" height="16" fill="currentColor" viewBox="0 0 16 16"><path d="M6.002 5.5a1.5 1.5 0 1 1-3 0 1.5 1.5 0 0 1 3 0"/><path d="M2.002 1a2 2 0 0 0-2 2v10a2 2 0 0 0 2 2h12a2 2 0 0 0 2-2V3a2 2 0 0 0-2-2zm12 1a1 1 0 0 1 1 1v6.5l-3.777-1.947a.5.5 0 0 0-.577.093l-3.71 3.71-2.66-1.772a.5.5 0 0 0-.63.062L1.002 12V3a1 1 0 0 1 1-1z"/></svg>
-                       Image
-                    </button>
-                    <button id="downloadBtn" class="bg-indigo-600 text-white text-sm font-bold py-1 px-3 rounded-lg hover:bg-indigo-700">Download HTML</button>
-                    <input type="file" id="imageUpload" class="hidden" accept="image/*">
-                </div>
-            </div>
-            <div class="iframe-wrapper">
-                <iframe id="editor-frame"></iframe>
-            </div>
-        </div>
-
-        <!-- Properties Panel -->
-        <div id="properties-panel" class="properties-panel"></div>
-    </div>
-
-    <script>
-        let websiteData = {};
-        let selectedElement = null;
-        let currentPageId = null;
-
-        document.addEventListener('DOMContentLoaded', () => {
-            const storedData = localStorage.getItem('websiteData');
-            if (storedData) {
-                websiteData = JSON.parse(storedData);
-                currentPageId = websiteData.pages[0]?.id;
-                renderPageTabs();
-                renderWebsiteInFrame();
-                renderPropertiesPanel(); // Initial render for global styles
-            } else {
-                alert("No website data found. Please start over.");
-                window.location.href = '/';
-            }
-            
-            document.getElementById('downloadBtn').addEventListener('click', downloadHTML);
-            document.getElementById('addTextBtn').addEventListener('click', () => addElementToPage('text'));
-            document.getElementById('addImageBtn').addEventListener('click', () => document.getElementById('imageUpload').click());
-            document.getElementById('imageUpload').addEventListener('change', handleImageUpload);
-        });
-
-        function generateStyleString(styles) {
-            let styleString = '';
-            const responsiveStyles = { base: '', md: '', lg: '' };
-            for (const [key, value] of Object.entries(styles)) {
-                const cssKey = key.replace(/[A-Z]/g, letter => `-${letter.toLowerCase()}`);
-                if (key.startsWith('md:')) {
-                    responsiveStyles.md += `${cssKey.substring(3)}: ${value}; `;
-                } else if (key.startsWith('lg:')) {
-                    responsiveStyles.lg += `${cssKey.substring(3)}: ${value}; `;
-                } else if (key.startsWith('hover:')) {
-                    // Hover styles handled separately
-                }
-                else {
-                    responsiveStyles.base += `${cssKey}: ${value}; `;
-                }
-            }
-            styleString += responsiveStyles.base;
-            if (responsiveStyles.md) styleString += `@media (min-width: 768px) { #${selectedElement?.id} { ${responsiveStyles.md} } }`;
-            if (responsiveStyles.lg) styleString += `@media (min-width: 1024px) { #${selectedElement?.id} { ${responsiveStyles.lg} } }`;
-            return styleString;
-        }
-
-        function buildNode(nodeData) {
-            const el = document.createElement(nodeData.type === 'heading' ? `h${nodeData.level || 1}` : nodeData.type === 'image' ? 'img' : 'div');
-            el.id = nodeData.id;
-            el.className = 'editable-element';
-            
-            if(nodeData.type !== 'section' && nodeData.type !== 'column') el.setAttribute('contenteditable', 'true');
-            if(nodeData.type === 'image') el.src = nodeData.src || '';
-            
-            el.innerHTML = nodeData.content || '';
-
-            let styleString = '';
-            for (const [key, value] of Object.entries(nodeData.styles || {})) {
-                const cssKey = key.replace(/[A-Z]/g, letter => `-${letter.toLowerCase()}`);
-                if (!cssKey.startsWith('hover:')) {
-                    styleString += `${cssKey}: ${value}; `;
-                }
-            }
-            el.style.cssText = styleString;
-
-            if (nodeData.children) {
-                nodeData.children.forEach(child => el.appendChild(buildNode(child)));
-            }
-            return el;
-        }
-
-        function renderWebsiteInFrame() {
-            const frame = document.getElementById('editor-frame');
-            const page = websiteData.pages.find(p => p.id === currentPageId);
-            if (!page) return;
-
-            const global = websiteData.globalStyles;
-            const googleFont = global.fontFamily.split(',')[0].replace(/'/g, "").replace(/\s/g, '+');
-            
-            let dynamicStyles = '';
-            
-            function collectDynamicStyles(nodes) {
-                nodes.forEach(node => {
-                    if (node.styles) {
-                        const hoverStyles = Object.entries(node.styles).filter(([k]) => k.startsWith('hover:'));
-                        if (hoverStyles.length > 0) {
-                            dynamicStyles += `#${node.id}:hover {`;
-                            hoverStyles.forEach(([k, v]) => {
-                                dynamicStyles += `${k.replace('hover:', '')}: ${v} !important;`;
-                            });
-                            dynamicStyles += `}`;
-                        }
-                    }
-                    if (node.children) {
-                        collectDynamicStyles(node.children);
-                    }
-                });
-            }
-            page.sections.forEach(section => collectDynamicStyles(section.children));
-
-            const bodyContent = document.createElement('body');
-            page.sections.forEach(sectionData => {
-                bodyContent.appendChild(buildNode(sectionData));
-            });
-
-            const html = `
-            <html><head>
-                <link rel="preconnect" href="https://fonts.googleapis.com">
-                <link rel="preconnect" href="https://fonts.gstatic.com" crossorigin>
-                <link href="https://fonts.googleapis.com/css2?family=${googleFont}:wght@400;700&display=swap" rel="stylesheet">
-                <style>
-                    :root {
-                        --background-color: ${global.backgroundColor}; --text-color: ${global.textColor};
-                        --primary-color: ${global.primaryColor}; --secondary-color: ${global.secondaryColor};
-                        --accent-color: ${global.accentColor};
-                    }
-                    body { font-family: ${global.fontFamily}; background-color: var(--background-color); color: var(--text-color); margin: 0; }
-                    .editable-element { cursor: pointer; min-height: 20px;}
-                    [contenteditable]:focus { outline: 1px dashed var(--accent-color); }
-                    ${dynamicStyles}
-                </style>
-            </head><body>${bodyContent.innerHTML}</body></html>`;
-
-            frame.srcdoc = html;
-            frame.onload = () => {
-                const frameDoc = frame.contentDocument;
-                frameDoc.querySelectorAll('.editable-element').forEach(el => {
-                    el.addEventListener('click', (e) => {
-                        e.stopPropagation();
-                        window.parent.postMessage({ type: 'elementSelected', id: el.id }, '*');
-                    });
-                });
-            };
-        }
-
-        function renderPropertiesPanel() {
-            const panel = document.getElementById('properties-panel');
-            let content = ``;
-
-            if (selectedElement) {
-                content += `<h2 class="text-lg font-bold mb-4 text-white">${selectedElement.type.charAt(0).toUpperCase() + selectedElement.type.slice(1)} Properties</h2>`;
-                content += `<details open class="panel-section"><summary>Content & Style</summary><div class="space-y-3 mt-2">`;
-                content += createTextControl('Content', 'content', selectedElement.content);
-                content += createColorControl('Color', 'styles.color', selectedElement.styles.color);
-                content += createColorControl('Background', 'styles.backgroundColor', selectedElement.styles.backgroundColor);
-                content += `</div></details>`;
-            } else {
-                content += `<h2 class="text-lg font-bold mb-4 text-white">Global Styles</h2>`;
-            }
-
-            content += `<details open class="panel-section"><summary>Global Styles</summary><div class="space-y-3 mt-2">`;
-            content += createFontSelect('Font Family', 'globalStyles.fontFamily', websiteData.globalStyles.fontFamily);
-            content += createColorControl('Background', 'globalStyles.backgroundColor', websiteData.globalStyles.backgroundColor);
-            content += createColorControl('Text', 'globalStyles.textColor', websiteData.globalStyles.textColor);
-            content += createColorControl('Primary', 'globalStyles.primaryColor', websiteData.globalStyles.primaryColor);
-            content += `</div></details>`;
-            
-            panel.innerHTML = content;
-            addPanelEventListeners();
-        }
-
-        // --- PROPERTY CONTROLS HELPERS ---
-        function createTextControl(label, key, value) { return `<div><label class="prop-label">${label}</label><input type="text" class="prop-input" data-key="${key}" value="${value || ''}"></div>`; }
-        function createColorControl(label, key, value) { return `<div><label class="prop-label">${label}</label><input type="color" class="prop-input" data-key="${key}" value="${value || '#ffffff'}"></div>`; }
-        function createFontSelect(label, key, value) {
-             const fonts = ["'Inter', sans-serif", "'Poppins', sans-serif", "'Roboto', sans-serif", "'Lora', serif", "'Playfair Display', serif"];
-             let options = fonts.map(f => `<option value="${f}" ${f === value ? 'selected' : ''}>${f.split(',')[0].replace(/'/g, '')}</option>`).join('');
-             return `<div><label class="prop-label">${label}</label><select class="prop-select" data-key="${key}">${options}</select></div>`;
-        }
-
-        // --- EVENT LISTENERS & HANDLERS ---
-        function addPanelEventListeners() {
-            document.querySelectorAll('#properties-panel .prop-input, #properties-panel select').forEach(input => {
-                input.addEventListener('input', (e) => handlePropertyChange(e));
-            });
-        }
-        
-        function handlePropertyChange(e) {
-            const keyPath = e.target.dataset.key;
-            let value = e.target.value;
-            const keys = keyPath.split('.');
-            let targetObject;
-
-            if (keyPath.startsWith('globalStyles')) {
-                 targetObject = websiteData;
-                 keys.forEach(key => { targetObject = targetObject[key]; });
-            } else if (selectedElement) {
-                 targetObject = selectedElement;
-                 keys.slice(0, -1).forEach(key => { targetObject = targetObject[key]; });
-            } else { return; }
-
-            targetObject[keys[keys.length - 1]] = value;
-            saveAndRerender();
-        }
-        
-        window.addEventListener('message', (event) => {
-            if (event.data.type === 'elementSelected') {
-                const elementId = event.data.id;
-                selectedElement = findElementById(elementId);
-                
-                const frameDoc = document.getElementById('editor-frame').contentDocument;
-                frameDoc.querySelectorAll('.selected-in-frame').forEach(el => el.classList.remove('selected-in-frame'));
-                if (selectedElement) {
-                    frameDoc.getElementById(elementId)?.classList.add('selected-in-frame');
-                }
-                renderPropertiesPanel();
-            }
-        });
-
-        function switchPage(pageId) {
-            currentPageId = pageId;
-            selectedElement = null;
-            renderPageTabs();
-            renderWebsiteInFrame();
-            renderPropertiesPanel();
-        }
-
-        function findNodeById(nodes, id) {
-            for (const node of nodes) {
-                if (node.id === id) return node;
-                if (node.children) {
-                    const found = findNodeById(node.children, id);
-                    if (found) return found;
-                }
-            }
-            return null;
-        }
-
-        function findElementById(id) {
-             const page = websiteData.pages.find(p => p.id === currentPageId);
-             if (!page) return null;
-             for (const section of page.sections) {
-                 const found = findNodeById([section], id);
-                 if (found) return found;
-             }
-             return null;
-        }
-
-        function saveAndRerender() {
-            localStorage.setItem('websiteData', JSON.stringify(websiteData));
-            renderWebsiteInFrame();
-            setTimeout(() => {
-                 if (selectedElement) {
-                     const frameDoc = document.getElementById('editor-frame').contentDocument;
-                     frameDoc.getElementById(selectedElement.id)?.classList.add('selected-in-frame');
-                 }
-            }, 150);
-        }
-        
-        function addElementToPage(type) {
-            const page = websiteData.pages.find(p => p.id === currentPageId);
-            if(!page || !page.sections.length || !page.sections[0].children.length) return;
-            
-            const firstColumn = page.sections[0].children[0];
-
-            const newElement = {
-                id: `el-${Date.now()}`, type: type,
-                content: type === 'text' ? 'New editable text block.' : 'Click Me',
-                styles: type === 'image' ? { width: '100%', height: 'auto', borderRadius: '0.75rem'} : { padding: '0.5rem 1rem', borderRadius: '0.5rem' },
-            };
-
-            if (type === 'image') {
-                newElement.content = 'abstract art'; // Placeholder query
-                newElement.src = 'https://placehold.co/400x300';
-            }
-            
-            firstColumn.children.push(newElement);
-            saveAndRerender();
-        }
-
-        function handleImageUpload(event) {
-            const file = event.target.files[0];
-            if (!file) return;
-
-            const reader = new FileReader();
-            reader.onload = (e) => {
-                const page = websiteData.pages.find(p => p.id === currentPageId);
-                if(!page || !page.sections.length || !page.sections[0].children.length) return;
-                const firstColumn = page.sections[0].children[0];
-
-                 const newElement = {
-                    id: `el-${Date.now()}`, type: 'image',
-                    content: 'Uploaded Image',
-                    src: e.target.result,
-                    styles: { width: '100%', height: 'auto', borderRadius: '0.75rem', marginTop: '1rem' }
-                };
-                firstColumn.children.push(newElement);
-                saveAndRerender();
-            };
-            reader.readAsDataURL(file);
-        }
-        
-        function downloadHTML() {
-            const global = websiteData.globalStyles;
-            const googleFont = global.fontFamily.split(',')[0].replace(/'/g, "").replace(/\s/g, '+');
-
-            let finalHtml = `<!DOCTYPE html><html lang="en"><head><meta charset="UTF-8">
-                <meta name="viewport" content="width=device-width, initial-scale=1.0">
-                <title>My Awesome Website</title>
-                 <script src="https://cdn.tailwindcss.com"></script>
-                <link rel="preconnect" href="https://fonts.googleapis.com">
-                <link rel="preconnect" href="https://fonts.gstatic.com" crossorigin>
-                <link href="https://fonts.googleapis.com/css2?family=${googleFont.replace(/ /g, '+')}:wght@400;700&display=swap" rel="stylesheet">
-                <style>
-                :root {
-                    --background-color: ${global.backgroundColor}; --text-color: ${global.textColor};
-                    --primary-color: ${global.primaryColor}; --secondary-color: ${global.secondaryColor};
-                    --accent-color: ${global.accentColor};
-                }
-                html { scroll-behavior: smooth; }
-                body { font-family: ${global.fontFamily}; background-color: var(--background-color); color: var(--text-color); margin: 0;}
-                </style>
-                </head><body>
-            `;
-            
-            // Build body from JSON
-            websiteData.pages.forEach(page => {
-                 page.sections.forEach(section => {
-                    finalHtml += buildNodeForDownload(section);
-                 });
-            });
-
-            finalHtml += `</body></html>`;
-
-            const blob = new Blob([finalHtml], { type: 'text/html' });
-            const url = URL.createObjectURL(blob);
-            const a = document.createElement('a');
-            a.href = url;
-            a.download = `website.html`;
-            a.click();
-            URL.revokeObjectURL(url);
-        }
-        
-        function buildNodeForDownload(nodeData) {
-            const typeMap = {
-                section: 'section',
-                column: 'div',
-                heading: `h${nodeData.level || 1}`,
-                text: 'p',
-                button: 'button',
-                image: 'img'
-            };
-            const tagName = typeMap[nodeData.type] || 'div';
-            let classes = ``; // In a real scenario, you'd map styles to tailwind classes
-            let inlineStyles = '';
-            for(const [key, val] of Object.entries(nodeData.styles || {})) {
-                inlineStyles += `${key.replace(/[A-Z]/g, letter => `-${letter.toLowerCase()}`)}: ${val};`;
-            }
-
-            let elementHtml = `<${tagName} id="${nodeData.id}" style="${inlineStyles}" class="${classes}">`;
-            if(nodeData.type === 'image') {
-                 elementHtml = `<${tagName} id="${nodeData.id}" src="${nodeData.src}" style="${inlineStyles}" class="${classes}">`;
-            } else {
-                elementHtml += nodeData.content || '';
-            }
-
-
-            if (nodeData.children) {
-                nodeData.children.forEach(child => {
-                    elementHtml += buildNodeForDownload(child);
-                });
-            }
-            if(nodeData.type !== 'image'){
-                elementHtml += `</${tagName}>`;
-            }
-
-            return elementHtml;
-        }
-
-    </script>
-</body>
-</html>
-''')
+    return render_template('website/preview.html')
 
 
+# Development server only; in production the app is served by gunicorn's gevent workers (see Procfile)
 if __name__ == '__main__':
     app.run(debug=True, port=5001)
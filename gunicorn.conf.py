@@ -0,0 +1,14 @@
+# Gunicorn settings for wsgi.py, which serves both apps (see Procfile).
+# gevent workers monkey-patch the standard library before loading the app, so blocking
+# Gemini/Unsplash calls yield to other requests instead of holding up a worker process.
+import multiprocessing
+import os
+
+bind = f"0.0.0.0:{os.getenv('PORT', '8000')}"
+worker_class = 'gevent'
+workers = int(os.getenv('WEB_CONCURRENCY', multiprocessing.cpu_count() * 2 + 1))
+# Exported so each worker can size its own process pools from the worker count
+os.environ['WEB_CONCURRENCY'] = str(workers)
+worker_connections = 1000
+# Longer than the slowest upstream read (300s for Gemini in the website generator)
+timeout = 310
@@ -0,0 +1,76 @@
+// Floating background particles, drawn on one <canvas> from a single requestAnimationFrame loop
+// instead of one CSS-animated DOM node (and compositor layer) per particle.
+(function () {
+    const canvas = document.getElementById('particles');
+    if (!canvas) return;
+
+    const ctx = canvas.getContext('2d');
+    const COUNT = 10;
+    const COLORS = ['#a78bfa', '#63b3ed'];
+    const MAX_OPACITY = 0.4;
+
+    // Particle state as parallel typed arrays: horizontal start (fraction of width), delay and duration (s)
+    const xs = new Float32Array(COUNT);
+    const delays = new Float32Array(COUNT);
+    const durations = new Float32Array(COUNT);
+    for (let i = 0; i < COUNT; i++) {
+        xs[i] = Math.random();
+        delays[i] = Math.random() * 10;
+        durations[i] = 10 + Math.random() * 10;
+    }
+
+    let width = 0, height = 0, radius = 1.5, sized = false, frame = 0;
+    function resize() {
+        sized = true;
+        const dpr = window.devicePixelRatio || 1;
+        width = window.innerWidth;
+        height = window.innerHeight;
+        canvas.width = Math.round(width * dpr);
+        canvas.height = Math.round(height * dpr);
+        ctx.setTransform(dpr, 0, 0, dpr, 0, 0);
+        radius = Math.min(4, Math.max(2, width * 0.005)) / 2;
+    }
+
+    function tick(now) {
+        ctx.clearRect(0, 0, width, height);
+        const seconds = now / 1000;
+        for (let i = 0; i < COUNT; i++) {
+            if (seconds < delays[i]) continue;
+            const progress = ((seconds - delays[i]) / durations[i]) % 1;
+            // Rise from just below the viewport to 10% above it, drifting 50px right, fading in and out
+            ctx.globalAlpha = MAX_OPACITY * Math.min(1, progress / 0.1, (1 - progress) / 0.1);
+            ctx.fillStyle = COLORS[i % 2];
+            ctx.beginPath();
+            ctx.arc(xs[i] * width + 50 * progress, height - 1.1 * height * progress, radius, 0, 2 * Math.PI);
+            ctx.fill();
+        }
+        frame = requestAnimationFrame(tick);
+    }
+
+    // Only animate while motion is allowed, the canvas is shown (it is hidden at 640px and below)
+    // and the tab is visible; the canvas is not even sized until the first time that is true
+    const reducedMotion = window.matchMedia('(prefers-reduced-motion: reduce)');
+    const smallScreen = window.matchMedia('(max-width: 640px)');
+    function update() {
+        const run = !reducedMotion.matches && !smallScreen.matches && !document.hidden;
+        if (run && !frame) {
+            if (!sized) resize();
+            frame = requestAnimationFrame(tick);
+        } else if (!run && frame) {
+            cancelAnimationFrame(frame);
+            frame = 0;
+            ctx.clearRect(0, 0, width, height);
+        }
+    }
+    reducedMotion.addEventListener('change', update);
+    smallScreen.addEventListener('change', update);
+    document.addEventListener('visibilitychange', update);
+
+    let resizeTimeout;
+    window.addEventListener('resize', () => {
+        if (!sized) return;
+        clearTimeout(resizeTimeout);
+        resizeTimeout = setTimeout(resize, 250);
+    }, { passive: true });
+    update();
+})();
@@ -0,0 +1,82 @@
+// Presentation storage shared by the subtopic page (which saves a new deck) and the editor.
+// Decks live in IndexedDB as one record per slide plus a 'meta' record (topic, theme, slide
+// count), so loading is asynchronous with no JSON.parse of the whole deck and an edit rewrites
+// only the slides it touched. localStorage is the fallback where IndexedDB is unavailable.
+const presentationStore = (() => {
+    const DB_NAME = 'presentation-generator';
+    const STORE = 'presentation';
+    const LEGACY_KEY = 'presentationData';
+    const slideKey = i => ['slide', i];
+    let dbPromise = null;
+
+    function openDb() {
+        if (!dbPromise) {
+            dbPromise = new Promise((resolve, reject) => {
+                const req = indexedDB.open(DB_NAME, 1);
+                req.onupgradeneeded = () => req.result.createObjectStore(STORE);
+                req.onsuccess = () => resolve(req.result);
+                req.onerror = () => reject(req.error);
+            });
+        }
+        return dbPromise;
+    }
+
+    function finished(tx) {
+        return new Promise((resolve, reject) => {
+            tx.oncomplete = () => resolve();
+            tx.onerror = tx.onabort = () => reject(tx.error);
+        });
+    }
+
+    function result(req) {
+        return new Promise((resolve, reject) => {
+            req.onsuccess = () => resolve(req.result);
+            req.onerror = () => reject(req.error);
+        });
+    }
+
+    // Writes the topic/theme and the given slides; with replace, everything stored before is dropped first
+    async function write(presentation, slideIndexes, replace) {
+        const { slides, ...meta } = presentation;
+        try {
+            const db = await openDb();
+            const tx = db.transaction(STORE, 'readwrite');
+            const store = tx.objectStore(STORE);
+            if (replace) store.clear();
+            store.put({ ...meta, slideCount: slides.length }, 'meta');
+            for (const i of slideIndexes) store.put(slides[i], slideKey(i));
+            await finished(tx);
+            if (replace) localStorage.removeItem(LEGACY_KEY);
+        } catch (error) {
+            console.warn('IndexedDB unavailable, saving to localStorage instead:', error);
+            localStorage.setItem(LEGACY_KEY, JSON.stringify(presentation));
+        }
+    }
+
+    async function load() {
+        try {
+            const db = await openDb();
+            const store = db.transaction(STORE).objectStore(STORE);
+            const [meta, slides] = await Promise.all([
+                result(store.get('meta')),
+                result(store.getAll(IDBKeyRange.bound(slideKey(0), slideKey(Infinity)))),
+            ]);
+            if (meta) {
+                const { slideCount, ...rest } = meta;
+                return { ...rest, slides: slides.slice(0, slideCount) };
+            }
+        } catch (error) {
+            console.warn('IndexedDB unavailable, reading from localStorage instead:', error);
+        }
+        const stored = localStorage.getItem(LEGACY_KEY);
+        return stored ? JSON.parse(stored) : null;
+    }
+
+    return {
+        load,
+        // Blobs survive IndexedDB's structured clone but not the localStorage fallback's JSON
+        canStoreBlobs: () => openDb().then(() => true, () => false),
+        save: presentation => write(presentation, presentation.slides.map((_, i) => i), true),
+        saveSlides: (presentation, slideIndexes) => write(presentation, slideIndexes, false),
+    };
+})();
@@ -1,695 +1,366 @@
 # app.py
-from flask import Flask, request, render_template_string, jsonify, send_from_directory
+from flask import Flask, request, render_template, jsonify, send_from_directory, Response
 import os
 import requests
+from requests.adapters import HTTPAdapter
 import json
 import time # For exponential backoff
+import random
+import hashlib
+import re
+import queue
+import tempfile
+import threading
+import asyncio
+from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor, TimeoutError as FutureTimeoutError
 from dotenv import load_dotenv
 from PIL import Image # Import the Pillow library for image resizing
+from flask.json.provider import DefaultJSONProvider
+from flask_caching import Cache
+from flask_compress import Compress
+from jinja2 import FileSystemBytecodeCache
+
+try:
+    import orjson # Optional: faster JSON encoding/decoding for Gemini payloads and responses
+except ImportError:
+    orjson = None
 
 # Load environment variables from .env file
 load_dotenv()
 
 app = Flask(__name__)
 
+# --- JSON provider backed by orjson, used for jsonify when it is installed ---
+class ORJSONProvider(DefaultJSONProvider):
+    def dumps(self, obj, **kwargs):
+        return orjson.dumps(obj, default=self.default).decode('utf-8')
+
+    def loads(self, s, **kwargs):
+        return orjson.loads(s)
+
+if orjson is not None:
+    app.json = ORJSONProvider(app)
+
+# Compress HTML/JSON responses (Brotli when the browser supports it); SSE streams are left alone
+app.config.update(COMPRESS_ALGORITHM=['br', 'gzip'], COMPRESS_LEVEL=5, COMPRESS_BR_LEVEL=5,
+                  COMPRESS_MIN_SIZE=500, COMPRESS_STREAMS=False)
+Compress(app)
+
+# Compiled templates are kept on disk so each new gunicorn worker skips the Jinja parse;
+# auto-reload stays tied to debug mode, so production never re-checks the template files
+app.jinja_env.bytecode_cache = FileSystemBytecodeCache()
+
+# Static files are cached by browsers for a year; their URLs carry a content hash so edits still show up
+app.config['SEND_FILE_MAX_AGE_DEFAULT'] = 31536000
+STATIC_HASHES = {}
+
+@app.url_defaults
+def add_static_version(endpoint, values):
+    if endpoint != 'static' or 'filename' not in values:
+        return
+    path = os.path.join(app.static_folder, values['filename'])
+    if not os.path.isfile(path):
+        return
+    mtime = os.path.getmtime(path)
+    cached = STATIC_HASHES.get(path)
+    if cached is None or cached[0] != mtime:
+        with open(path, 'rb') as f:
+            cached = STATIC_HASHES[path] = (mtime, hashlib.sha1(f.read()).hexdigest()[:12])
+    values['v'] = cached[1]
+
 # --- API Keys Configuration ---
 GEMINI_API_KEY = os.getenv("GEMINI_API_KEY", "YOUR_GEMINI_API_KEY_HERE")
 UNSPLASH_ACCESS_KEY = os.getenv("UNSPLASH_ACCESS_KEY", "YOUR_UNSPLASH_ACCESS_KEY_HERE")
 # -----------------------------
 
+# Gemini endpoint, built once at import
+GEMINI_GENERATE_URL = f"https://generativelanguage.googleapis.com/v1beta/models/gemini-1.5-flash-latest:generateContent?key={GEMINI_API_KEY}"
+
 # Directory for storing downloaded images
 BASE_DIR = os.path.abspath(os.path.dirname(__file__))
 IMAGES_DIR = os.path.join(BASE_DIR, 'images')
 if not os.path.exists(IMAGES_DIR):
     os.makedirs(IMAGES_DIR)
 
+# Shared HTTP session so Gemini and Unsplash calls reuse pooled keep-alive connections
+SESSION = requests.Session()
+SESSION.mount('https://', HTTPAdapter(pool_connections=50, pool_maxsize=50, max_retries=0))
+
+# Slide images are at most 1280x720. Unsplash's CDN delivers them pre-sized as JPEG, so those skip Pillow entirely
+SLIDE_IMAGE_SIZE = (1280, 720)
+UNSPLASH_IMAGE_PARAMS = '&w=1280&h=720&fit=max&fm=jpg&q=85'
+UNSPLASH_CDN_PREFIX = 'https://images.unsplash.com/'
+# Unsplash search results change rarely, so a query's photos are reused for a week
+IMAGE_URL_CACHE_TIMEOUT = 7 * 24 * 60 * 60
+
+# On-disk cache for subtopic suggestions, generated decks and Unsplash lookups, shared by all worker processes and capped at 1024 entries
+cache = Cache(app, config={
+    'CACHE_TYPE': 'FileSystemCache',
+    # Not Complete.py's gemini_cache: its Unsplash URLs use other size parameters and it prunes to its own threshold
+    'CACHE_DIR': os.path.join(BASE_DIR, 'presenter_cache'),
+    'CACHE_DEFAULT_TIMEOUT': 86400,
+    'CACHE_THRESHOLD': 1024
+})
+
+# --- Helper to open pooled connections to the API hosts before the first real request ---
+def warm_up_connections():
+    for host in ("https://generativelanguage.googleapis.com", "https://api.unsplash.com"):
+        try:
+            SESSION.head(host, timeout=5)
+        except requests.exceptions.RequestException as e:
+            print(f"Could not pre-connect to {host}: {e}")
+
+# Runs in the background so a slow DNS lookup or handshake doesn't delay worker startup
+threading.Thread(target=warm_up_connections, daemon=True, name='connection-warmup').start()
+
+# Image downloads currently in progress, keyed by source URL, so duplicates share one download
+IMAGE_DOWNLOADS = {}
+IMAGE_DOWNLOADS_LOCK = threading.Lock()
+
+# Subtopic requests arriving within 50ms of each other share one Gemini call (up to 16 topics)
+SUBTOPIC_QUEUE = queue.Queue()
+SUBTOPIC_BATCH_SIZE = 16
+SUBTOPIC_BATCH_WINDOW = 0.05
+# How long a request waits on the batcher or on another request's image download before doing the work itself
+SHARED_WORK_TIMEOUT = 60
+
+# Bounded pool for Unsplash lookups and downloads, so a deck's images are fetched in parallel
+IMAGE_EXECUTOR = ThreadPoolExecutor(max_workers=8, thread_name_prefix='image-fetch')
+# Pillow decoding and resampling is CPU-bound, so it runs in separate processes to keep it off the GIL.
+# Every gunicorn worker gets its own pool, so the cores are shared out between the WEB_CONCURRENCY
+# workers (one process each unless there are spare cores), and the pool is only started on first use
+RESIZE_WORKERS = max(1, (os.cpu_count() or 1) // int(os.getenv('WEB_CONCURRENCY', os.cpu_count() or 1)))
+RESIZE_EXECUTOR = None
+RESIZE_EXECUTOR_LOCK = threading.Lock()
+
+def get_resize_executor():
+    global RESIZE_EXECUTOR
+    with RESIZE_EXECUTOR_LOCK:
+        if RESIZE_EXECUTOR is None:
+            RESIZE_EXECUTOR = ProcessPoolExecutor(max_workers=RESIZE_WORKERS)
+        return RESIZE_EXECUTOR
+
+# --- Helper functions to encode and parse JSON, using orjson when installed ---
+def dump_json(obj):
+    return orjson.dumps(obj) if orjson is not None else json.dumps(obj).encode('utf-8')
+
+def parse_json(text):
+    return orjson.loads(text) if orjson is not None else json.loads(text)
+
 # --- Helper function for exponential backoff ---
-def api_call_with_backoff(url, headers, payload, max_retries=5, initial_delay=1):
+def api_call_with_backoff(url, headers, payload, max_retries=5, initial_delay=1, max_delay=30):
     for i in range(max_retries):
+        # Capped exponential backoff with +/-20% jitter, so workers don't retry in lockstep
+        delay = min(max_delay, initial_delay * (2 ** i)) * (0.8 + 0.4 * random.random())
         try:
-            response = requests.post(url, headers=headers, data=json.dumps(payload), timeout=180)
+            response = SESSION.post(url, headers=headers, data=dump_json(payload), timeout=180)
             if not response.ok:
                 print(f"--- API Error Response ---")
                 print(f"Status Code: {response.status_code}")
-                try: print(f"Response JSON: {response.json()}")
+                try: print(f"Response JSON: {parse_json(response.content)}")
                 except json.JSONDecodeError: print(f"Response Text: {response.text}")
                 print(f"--------------------------")
+                retry_after = response.headers.get('Retry-After')
+                if response.status_code in (429, 503) and retry_after and retry_after.isdigit():
+                    delay = min(max_delay, int(retry_after))
             response.raise_for_status()
-            return response.json()
+            return parse_json(response.content)
         except requests.exceptions.HTTPError as e:
             print(f"API call failed with HTTPError (retry {i+1}/{max_retries}): {e}")
             if i >= max_retries - 1: raise
-            time.sleep(initial_delay * (2 ** i))
+            time.sleep(delay)
         except (requests.exceptions.RequestException, requests.exceptions.Timeout) as e:
             print(f"API call failed with network error (retry {i+1}/{max_retries}): {e}")
             if i >= max_retries - 1: raise
-            time.sleep(initial_delay * (2 ** i))
+            time.sleep(delay)
+
+# --- Helper function to shrink an image file to fit a slide, re-encoded as JPEG (runs in the resize pool) ---
+def fit_slide_image(path):
+    with Image.open(path) as img:
+        max_w, max_h = SLIDE_IMAGE_SIZE
+        scale = max(img.width / max_w, img.height / max_h)
+        resample = Image.Resampling.BILINEAR if scale < 1.5 else Image.Resampling.LANCZOS
+        img.thumbnail(SLIDE_IMAGE_SIZE, resample)
+        img.convert('RGB').save(path, 'JPEG', quality=90)
 
 # --- Helper function to download and resize an image ---
 def download_image(image_url, filename):
+    filepath = os.path.join(IMAGES_DIR, filename)
+    # Write to a private temp file and rename, so a half-written image is never served. mkstemp names
+    # are unique across worker processes and greenlets, which can share a thread ident
+    fd, temp_path = tempfile.mkstemp(dir=IMAGES_DIR, suffix='.part')
     try:
-        response = requests.get(image_url, stream=True)
-        response.raise_for_status()
-        with Image.open(response.raw) as img:
-            img.thumbnail((1280, 720), Image.Resampling.LANCZOS)
-            filepath = os.path.join(IMAGES_DIR, filename)
-            img.save(filepath, 'JPEG', quality=90)
+        with os.fdopen(fd, 'wb') as f, SESSION.get(image_url, stream=True, timeout=30) as response:
+            response.raise_for_status()
+            for chunk in response.iter_content(chunk_size=64 * 1024):
+                f.write(chunk)
+        # Other sources may be any size or format. Opening only parses the header; resample only when needed
+        if not (image_url.startswith(UNSPLASH_CDN_PREFIX) and UNSPLASH_IMAGE_PARAMS in image_url):
+            with Image.open(temp_path) as img:
+                max_w, max_h = SLIDE_IMAGE_SIZE
+                needs_resize = img.format != 'JPEG' or img.width > max_w or img.height > max_h
+            if needs_resize:
+                get_resize_executor().submit(fit_slide_image, temp_path).result()
+        os.chmod(temp_path, 0o644) # mkstemp creates the file readable by its owner only
+        os.replace(temp_path, filepath)
         return os.path.join('images', filename).replace('\\', '/')
     except Exception as e:
         print(f"Error during image processing: {e}")
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
         return None
 
 # --- Helper function to search Unsplash ---
 def search_unsplash_image(query):
     if not UNSPLASH_ACCESS_KEY or UNSPLASH_ACCESS_KEY == "YOUR_UNSPLASH_ACCESS_KEY_HERE":
         return None
+    key = f"unsplash:{query}"
+    if (image_url := cache.get(key)) is not None:
+        return image_url
     url = "https://api.unsplash.com/search/photos"
     params = {"query": query, "per_page": 1, "orientation": "landscape"}
     headers = {"Authorization": f"Client-ID {UNSPLASH_ACCESS_KEY}"}
     try:
-        res = requests.get(url, headers=headers, params=params)
+        res = SESSION.get(url, headers=headers, params=params, timeout=30)
         res.raise_for_status()
         data = res.json()
-        return data['results'][0]['urls']['regular'] if data['results'] else None
+        if not data['results']:
+            return None
+        image_url = data['results'][0]['urls']['raw'] + UNSPLASH_IMAGE_PARAMS
+        cache.set(key, image_url, timeout=IMAGE_URL_CACHE_TIMEOUT)
+        return image_url
     except Exception as e:
         print(f"Error searching Unsplash: {e}")
         return None
 
+# --- Helper function to match a deck's image queries against one Unsplash search for the topic ---
+def search_unsplash_images_batch(topic, queries):
+    if not queries or not UNSPLASH_ACCESS_KEY or UNSPLASH_ACCESS_KEY == "YOUR_UNSPLASH_ACCESS_KEY_HERE":
+        return {}
+    # Only each photo's URL and searchable text are kept, which is all the ranking below needs
+    key = f"unsplash-topic:{topic.strip().lower()}"
+    photos = cache.get(key)
+    if photos is None:
+        url = "https://api.unsplash.com/search/photos"
+        params = {"query": topic, "per_page": 30, "orientation": "landscape"}
+        headers = {"Authorization": f"Client-ID {UNSPLASH_ACCESS_KEY}"}
+        try:
+            res = SESSION.get(url, headers=headers, params=params, timeout=30)
+            res.raise_for_status()
+            photos = [(p['urls']['raw'] + UNSPLASH_IMAGE_PARAMS,
+                       ' '.join([p.get('alt_description') or '', p.get('description') or '']
+                                + [tag.get('title', '') for tag in p.get('tags', [])]))
+                      for p in res.json()['results']]
+        except Exception as e:
+            print(f"Error searching Unsplash: {e}")
+            return {}
+        cache.set(key, photos, timeout=IMAGE_URL_CACHE_TIMEOUT)
+
+    # Rank photos for each query by how many of its words appear in the photo's description and tags
+    def words(text):
+        return set(re.findall(r'[a-z0-9]+', (text or '').lower()))
+    photo_words = [words(text) for _, text in photos]
+    matches, used = {}, set()
+    for query in dict.fromkeys(queries):
+        query_words = words(query)
+        scores = [(len(query_words & pw), i) for i, pw in enumerate(photo_words) if i not in used]
+        score, best = max(scores, default=(0, None))
+        if score:
+            used.add(best)
+            matches[query] = photos[best][0]
+    return matches
+
+# --- Helper function to ask Gemini for subtopics, cached by normalized topic ---
+def gemini_subtopics(main_topic):
+    topic_key = main_topic.strip().lower()
+    cache_key = f"subtopics:{topic_key}"
+    if (subtopics := cache.get(cache_key)) is not None:
+        return subtopics
+    future = Future()
+    SUBTOPIC_QUEUE.put((topic_key, main_topic.strip(), future))
+    try:
+        subtopics = future.result(timeout=SHARED_WORK_TIMEOUT)
+    except FutureTimeoutError:
+        print(f"Subtopic batcher did not answer within {SHARED_WORK_TIMEOUT}s, asking Gemini directly.")
+        subtopics = gemini_subtopics_batch([main_topic.strip()])[0]
+    cache.set(cache_key, subtopics)
+    return subtopics
+
+# --- Helper function to suggest subtopics for several topics in one Gemini call ---
+def gemini_subtopics_batch(topics):
+    topic_list = '\n'.join(f'{i}. "{topic}"' for i, topic in enumerate(topics, 1))
+    prompt = f'For each presentation topic below, suggest 6 core subtopics. Exclude "Introduction" and "Conclusion". Return a JSON array with one entry per topic, in the same order, where each entry is an array of subtopic strings. Example for two topics: [["Subtopic 1", "Subtopic 2"], ["Subtopic 1", "Subtopic 2"]]\n\nTopics:\n{topic_list}'
+    api_url = GEMINI_GENERATE_URL
+    payload = {"contents": [{"parts": [{"text": prompt}]}], "generationConfig": {"temperature": 0.5, "responseMimeType": "application/json"}}
+    result = api_call_with_backoff(api_url, {'Content-Type': 'application/json'}, payload)
+    suggestions = parse_json(result['candidates'][0]['content']['parts'][0]['text'])
+    if len(suggestions) != len(topics):
+        raise ValueError(f"Expected subtopics for {len(topics)} topics, got {len(suggestions)}.")
+    return [[str(st).strip() for st in subtopics if str(st).strip()] for subtopics in suggestions]
+
+# --- Background worker that collects concurrent subtopic requests into batches ---
+def subtopic_batcher():
+    while True:
+        batch = [SUBTOPIC_QUEUE.get()]
+        deadline = time.monotonic() + SUBTOPIC_BATCH_WINDOW
+        while len(batch) < SUBTOPIC_BATCH_SIZE and (remaining := deadline - time.monotonic()) > 0:
+            try:
+                batch.append(SUBTOPIC_QUEUE.get(timeout=remaining))
+            except queue.Empty:
+                break
+        # Identical topics in the same window are only asked about once
+        topics = {topic_key: topic for topic_key, topic, _ in batch}
+        try:
+            results = dict(zip(topics, gemini_subtopics_batch(list(topics.values()))))
+        except Exception as e:
+            for _, _, future in batch:
+                future.set_exception(e)
+            continue
+        for topic_key, _, future in batch:
+            future.set_result(results[topic_key])
+
+threading.Thread(target=subtopic_batcher, daemon=True, name='subtopic-batcher').start()
+
+# --- Helper function to save an image at most once per source URL ---
+def save_image_once(image_url):
+    # Named after the source URL, so a saved file never changes and can be cached forever
+    filename = f"{hashlib.sha1(image_url.encode()).hexdigest()[:16]}.jpg"
+    if os.path.exists(os.path.join(IMAGES_DIR, filename)):
+        return f"images/{filename}"
+    with IMAGE_DOWNLOADS_LOCK:
+        future = IMAGE_DOWNLOADS.get(image_url)
+        is_leader = future is None
+        if is_leader:
+            future = IMAGE_DOWNLOADS[image_url] = Future()
+    if not is_leader:
+        try:
+            return future.result(timeout=SHARED_WORK_TIMEOUT)
+        except FutureTimeoutError:
+            return download_image(image_url, filename)
+    try:
+        local_image_path = download_image(image_url, filename)
+        future.set_result(local_image_path)
+        return local_image_path
+    finally:
+        with IMAGE_DOWNLOADS_LOCK:
+            IMAGE_DOWNLOADS.pop(image_url, None)
+
+# --- Helper function to find and save the image for one slide element ---
+def fetch_and_save_image(query, image_url=None):
+    image_url = image_url or search_unsplash_image(query)
+    local_image_path = save_image_once(image_url) if image_url else None
+    return local_image_path or "https://placehold.co/600x400/1e293b/e2e8f0?text=Image+Not+Found"
+
 @app.route('/')
 def index():
-    return render_template_string('''
-        <!DOCTYPE html>
-<html lang="en">
-<head>
-    <meta charset="UTF-8">
-    <meta name="viewport" content="width=device-width, initial-scale=1.0">
-    <title>AI Presentation Generator</title>
-    <script src="https://cdn.tailwindcss.com"></script>
-    <link href="https://fonts.googleapis.com/css2?family=Inter:wght@400;600;700&display=swap" rel="stylesheet">
-    <style>
-        * {
-            box-sizing: border-box;
-        }
-
-        body { 
-            font-family: 'Inter', sans-serif; 
-            background: linear-gradient(135deg, #0f172a 0%, #1e293b 50%, #334155 100%);
-            color: #e2e8f0; 
-            min-height: 100vh;
-            margin: 0;
-            padding: 0;
-            overflow-x: hidden;
-            position: relative;
-            display: flex;
-            align-items: center;
-            justify-content: center;
-        }
-
-        /* Optimized Background Elements - Better Performance */
-        .bg-animation {
-            position: fixed;
-            top: 0;
-            left: 0;
-            width: 100%;
-            height: 100%;
-            pointer-events: none;
-            z-index: 1;
-            will-change: transform;
-        }
-
-        .floating-orb {
-            position: absolute;
-            border-radius: 50%;
-            background: radial-gradient(circle, rgba(99, 179, 237, 0.4) 0%, rgba(139, 92, 246, 0.2) 70%, transparent 100%);
-            animation: float 8s ease-in-out infinite;
-            will-change: transform;
-            backface-visibility: hidden;
-        }
-
-        .floating-orb:nth-child(1) {
-            width: clamp(60px, 8vw, 120px);
-            height: clamp(60px, 8vw, 120px);
-            top: 15%;
-            left: 10%;
-            animation-delay: 0s;
-        }
-
-        .floating-orb:nth-child(2) {
-            width: clamp(40px, 6vw, 80px);
-            height: clamp(40px, 6vw, 80px);
-            top: 60%;
-            right: 15%;
-            animation-delay: 2s;
-        }
-
-        .floating-orb:nth-child(3) {
-            width: clamp(80px, 10vw, 150px);
-            height: clamp(80px, 10vw, 150px);
-            bottom: 15%;
-            left: 20%;
-            animation-delay: 4s;
-        }
-
-        .floating-orb:nth-child(4) {
-            width: clamp(30px, 4vw, 60px);
-            height: clamp(30px, 4vw, 60px);
-            top: 30%;
-            right: 30%;
-            animation-delay: 1s;
-        }
-
-        @keyframes float {
-            0%, 100% { 
-                transform: translateY(0px) translateX(0px) scale(1); 
-                opacity: 0.6;
-            }
-            50% { 
-                transform: translateY(-15px) translateX(10px) scale(1.05); 
-                opacity: 0.8;
-            }
-        }
-
-        /* Responsive Grid Pattern */
-        .grid-pattern {
-            position: fixed;
-            top: 0;
-            left: 0;
-            width: 100%;
-            height: 100%;
-            background-image: 
-                linear-gradient(rgba(99, 179, 237, 0.08) 1px, transparent 1px),
-                linear-gradient(90deg, rgba(99, 179, 237, 0.08) 1px, transparent 1px);
-            background-size: clamp(30px, 5vw, 50px) clamp(30px, 5vw, 50px);
-            animation: gridMove 25s linear infinite;
-            z-index: 1;
-            will-change: transform;
-        }
-
-        @keyframes gridMove {
-            0% { transform: translate(0, 0); }
-            100% { transform: translate(50px, 50px); }
-        }
-
-        /* Responsive Container */
-        .container { 
-            max-width: min(90vw, 650px);
-            margin: clamp(20px, 5vh, 50px) auto;
-            padding: clamp(1.5rem, 4vw, 3rem);
-            background: rgba(30, 41, 59, 0.95);
-            backdrop-filter: blur(20px);
-            border: 1px solid rgba(99, 179, 237, 0.3);
-            border-radius: clamp(1rem, 2vw, 1.5rem);
-            box-shadow: 
-                0 25px 50px -12px rgba(0, 0, 0, 0.6),
-                0 0 0 1px rgba(99, 179, 237, 0.1),
-                inset 0 1px 0 rgba(255, 255, 255, 0.1);
-            position: relative;
-            z-index: 10;
-            transition: transform 0.3s cubic-bezier(0.4, 0, 0.2, 1);
-            display: flex;
-            flex-direction: column;
-            align-items: center;
-            justify-content: center;
-        }
-
-        @media (hover: hover) {
-            .container:hover {
-                transform: translateY(-3px);
-            }
-        }
-
-        /* Enhanced Input Styling - Mobile Optimized */
-        input[type="text"] { 
-            width: 100%; 
-            padding: clamp(0.75rem, 3vw, 1rem) clamp(1rem, 4vw, 1.5rem);
-            border-radius: clamp(0.5rem, 2vw, 0.75rem);
-            border: 2px solid rgba(71, 85, 105, 0.4);
-            background: rgba(51, 65, 85, 0.9);
-            backdrop-filter: blur(10px);
-            color: #e2e8f0; 
-            transition: all 0.3s cubic-bezier(0.4, 0, 0.2, 1);
-            font-size: clamp(1rem, 3vw, 1.1rem);
-            line-height: 1.5;
-            -webkit-appearance: none;
-            appearance: none;
-        }
-
-        input[type="text"]:focus { 
-            border-color: #63b3ed; 
-            box-shadow: 
-                0 0 0 3px rgba(99, 179, 237, 0.25),
-                0 8px 25px rgba(99, 179, 237, 0.15);
-            outline: none; 
-            transform: translateY(-1px);
-        }
-
-        /* Mobile-First Button Styling */
-        button { 
-            background: linear-gradient(135deg, #63b3ed, #90cdf4);
-            color: #1a202c; 
-            padding: clamp(0.75rem, 3vw, 1rem) clamp(1.5rem, 5vw, 2.5rem);
-            border-radius: clamp(0.75rem, 2vw, 1rem);
-            font-weight: 600; 
-            cursor: pointer; 
-            border: none; 
-            transition: all 0.3s cubic-bezier(0.4, 0, 0.2, 1);
-            font-size: clamp(1rem, 3vw, 1.1rem);
-            position: relative;
-            overflow: hidden;
-            box-shadow: 0 8px 25px rgba(99, 179, 237, 0.3);
-            min-height: 48px; /* Touch target size */
-            display: inline-flex;
-            align-items: center;
-            justify-content: center;
-            white-space: nowrap;
-            padding: clamp(0.75rem, 3vw, 1rem) calc(clamp(1.5rem, 5vw, 2.5rem) + 3px);
-        }
-
-        /* Make the main button extra wide and center it */
-        #submitBtn {
-            width: 320px !important;
-            max-width: 100%;
-            margin: 0 auto;
-            display: block;
-            font-size: 1.15rem;
-        }
-
-        @media (hover: hover) {
-            button:hover:not(:disabled) { 
-                background: linear-gradient(135deg, #90cdf4, #bee3f8);
-                transform: translateY(-2px);
-                box-shadow: 0 12px 35px rgba(99, 179, 237, 0.4);
-            }
-        }
-
-        /* Touch feedback for mobile */
-        button:active:not(:disabled) {
-            transform: translateY(0);
-            transition: transform 0.1s;
-        }
-
-        button:disabled { 
-            background: linear-gradient(135deg, #4a5568, #2d3748);
-            cursor: not-allowed; 
-            color: #a0aec0;
-            transform: none;
-        }
-
-        /* Responsive Loading Spinner */
-        .loading-spinner { 
-            border: 3px solid rgba(99, 179, 237, 0.3); 
-            border-top: 3px solid #63b3ed; 
-            border-radius: 50%; 
-            width: clamp(28px, 5vw, 35px);
-            height: clamp(28px, 5vw, 35px);
-            animation: spin 1s linear infinite; 
-            display: none; 
-            margin-left: clamp(0.75rem, 3vw, 1.5rem);
-            flex-shrink: 0;
-        }
-
-        @keyframes spin { 
-            to { transform: rotate(360deg); } 
-        }
-
-        /* Responsive Title */
-        .title-glow {
-            background: linear-gradient(135deg, #63b3ed, #a78bfa, #f093fb);
-            background-size: 200% 200%;
-            -webkit-background-clip: text;
-            -webkit-text-fill-color: transparent;
-            background-clip: text;
-            animation: gradientShift 4s ease infinite;
-            font-size: clamp(2rem, 8vw, 3rem);
-            line-height: 1.2;
-            margin-bottom: clamp(1rem, 4vw, 1.5rem);
-        }
-
-        @keyframes gradientShift {
-            0%, 100% { background-position: 0% 50%; }
-            50% { background-position: 100% 50%; }
-        }
-
-        /* Optimized Particles - Reduced for mobile */
-        .particle {
-            position: absolute;
-            width: clamp(2px, 0.5vw, 4px);
-            height: clamp(2px, 0.5vw, 4px);
-            background: #63b3ed;
-            border-radius: 50%;
-            animation: particleFloat 10s linear infinite;
-            opacity: 0.4;
-            will-change: transform;
-            pointer-events: none;
-        }
-
-        .particle:nth-child(odd) {
-            background: #a78bfa;
-            animation-duration: 15s;
-        }
-
-        @keyframes particleFloat {
-            0% {
-                transform: translateY(100vh) translateX(0);
-                opacity: 0;
-            }
-            10%, 90% {
-                opacity: 0.4;
-            }
-            100% {
-                transform: translateY(-10vh) translateX(50px);
-                opacity: 0;
-            }
-        }
-
-        /* Form Enhancements */
-        .form-group {
-            position: relative;
-            margin-bottom: clamp(1.5rem, 4vw, 2rem);
-        }
-
-        .form-group::before {
-            content: '✨';
-            position: absolute;
-            left: clamp(0.75rem, 3vw, 1rem);
-            top: 50%;
-            transform: translateY(-50%);
-            z-index: 1;
-            opacity: 0.7;
-            font-size: clamp(1rem, 3vw, 1.2rem);
-            pointer-events: none;
-        }
-
-        input[type="text"] {
-            padding-left: clamp(2.5rem, 8vw, 3.5rem);
-        }
-
-        /* Responsive Text */
-        .description-text {
-            font-size: clamp(1rem, 3vw, 1.125rem);
-            line-height: 1.6;
-            margin-bottom: clamp(2rem, 5vw, 2.5rem);
-        }
-
-        .label-text {
-            font-size: clamp(1rem, 3vw, 1.125rem);
-            margin-bottom: clamp(0.75rem, 2vw, 1rem);
-        }
-
-        /* Button Container */
-        .button-container {
-            display: flex;
-            align-items: center;
-            justify-content: center;
-            flex-wrap: nowrap;
-            gap: clamp(0.75rem, 3vw, 1.5rem);
-            margin-top: clamp(1.5rem, 4vw, 2rem);
-        }
-
-        /* Media Queries for Better Control */
-        @media (max-width: 640px) {
-            .floating-orb {
-                animation-duration: 12s; /* Slower on mobile for better performance */
-            }
-            
-            .grid-pattern {
-                animation-duration: 30s; /* Slower grid animation */
-                opacity: 0.5; /* Reduce opacity on mobile */
-            }
-            
-            .particle {
-                display: none; /* Hide particles on very small screens */
-            }
-            #submitBtn {
-                width: 100% !important;
-            }
-        }
-
-        @media (max-width: 480px) {
-            .container {
-                margin: 10px;
-                width: calc(100vw - 20px);
-            }
-            
-            .button-container {
-                flex-direction: column;
-                align-items: stretch;
-            }
-            
-            #submitBtn {
-                width: 100% !important;
-            }
-            
-            .loading-spinner {
-                margin-left: 0;
-                margin-top: 1rem;
-            }
-        }
-
-        /* Reduce motion for accessibility */
-        @media (prefers-reduced-motion: reduce) {
-            .floating-orb,
-            .grid-pattern,
-            .particle,
-            .title-glow {
-                animation: none;
-            }
-            
-            .container:hover {
-                transform: none;
-            }
-            
-            button:hover:not(:disabled) {
-                transform: none;
-            }
-        }
-
-        /* High contrast mode support */
-        @media (prefers-contrast: high) {
-            .container {
-                border: 2px solid #63b3ed;
-                background: rgba(15, 23, 42, 0.95);
-            }
-            
-            input[type="text"] {
-                border: 2px solid #63b3ed;
-            }
-        }
-
-        /* Fade-in with better performance */
-        .fade-in {
-            animation: fadeIn 0.8s cubic-bezier(0.4, 0, 0.2, 1) forwards;
-            opacity: 0;
-        }
-
-        @keyframes fadeIn {
-            from { 
-                opacity: 0; 
-                transform: translateY(20px);
-            }
-            to { 
-                opacity: 1; 
-                transform: translateY(0);
-            }
-        }
-    </style>
-</head>
-<body>
-    <!-- Background Animation Elements -->
-    <div class="bg-animation">
-        <div class="grid-pattern"></div>
-        <div class="floating-orb"></div>
-        <div class="floating-orb"></div>
-        <div class="floating-orb"></div>
-        <div class="floating-orb"></div>
-    </div>
-
-    <!-- Floating Particles -->
-    <div id="particles" aria-hidden="true"></div>
-
-    <div class="container text-center fade-in">
-        <h1 class="title-glow font-bold">🚀 AI Presentation Generator</h1>
-        <p class="description-text text-gray-300">Transform any topic into a stunning, interactive presentation with the power of AI</p>
-        
-        <form id="topicForm" onsubmit="submitTopic(event)" novalidate>
-            <div class="text-left">
-                <label for="topic" class="label-text text-gray-200 block font-semibold">What would you like to present?</label>
-                <div class="form-group">
-                    <input 
-                        type="text" 
-                        id="topic" 
-                        name="topic" 
-                        placeholder="e.g., The Future of Artificial Intelligence" 
-                        required
-                        autocomplete="off"
-                        spellcheck="true"
-                    >
-                </div>
-            </div>
-            <div class="button-container">
-                <button type="submit" id="submitBtn" aria-describedby="loading-status">
-                       Generate Slides
-                </button>
-                <div id="loadingSpinner" class="loading-spinner" role="status" aria-label="Loading"></div>
-            </div>
-            <div id="loading-status" class="sr-only" aria-live="polite"></div>
-        </form>
-    </div>
-
-    <script>
-        // Performance optimized particle creation
-        function createParticles() {
-            const particlesContainer = document.getElementById('particles');
-            const isMobile = window.innerWidth < 640;
-            const particleCount = isMobile ? 5 : 10; // Fewer particles on mobile
-            
-            for (let i = 0; i < particleCount; i++) {
-                const particle = document.createElement('div');
-                particle.className = 'particle';
-                particle.style.left = Math.random() * 100 + '%';
-                particle.style.animationDelay = Math.random() * 10 + 's';
-                particle.style.animationDuration = (10 + Math.random() * 10) + 's';
-                particlesContainer.appendChild(particle);
-            }
-        }
-
-        // Debounced resize handler
-        let resizeTimeout;
-        function handleResize() {
-            clearTimeout(resizeTimeout);
-            resizeTimeout = setTimeout(() => {
-                // Recreate particles on significant resize
-                const particlesContainer = document.getElementById('particles');
-                if (particlesContainer) {
-                    particlesContainer.innerHTML = '';
-                    createParticles();
-                }
-            }, 250);
-        }
-
-        // Initialize with better error handling
-        function initialize() {
-            try {
-                createParticles();
-                window.addEventListener('resize', handleResize, { passive: true });
-                
-                // Preload form validation
-                const form = document.getElementById('topicForm');
-                const input = document.getElementById('topic');
-                
-                if (input) {
-                    input.addEventListener('input', function() {
-                        this.setCustomValidity('');
-                    });
-                }
-            } catch (error) {
-                console.warn('Non-critical initialization error:', error);
-            }
-        }
-
-        // Enhanced form validation
-        function validateInput(topic) {
-            if (!topic || topic.trim().length < 2) {
-                return 'Please enter a topic with at least 2 characters.';
-            }
-            if (topic.trim().length > 200) {
-                return 'Topic is too long. Please keep it under 200 characters.';
-            }
-            return null;
-        }
-
-        // Original JavaScript functionality with enhancements
-        async function submitTopic(event) {
-            event.preventDefault();
-            
-            const btn = document.getElementById('submitBtn');
-            const spinner = document.getElementById('loadingSpinner');
-            const topic = document.getElementById('topic').value;
-            const statusElement = document.getElementById('loading-status');
-            
-            // Enhanced validation
-            const validationError = validateInput(topic);
-            if (validationError) {
-                alert(validationError);
-                return;
-            }
-            
-            // UI state management
-            btn.disabled = true;
-            btn.innerHTML = 'Generating...';
-            spinner.style.display = 'inline-block';
-            statusElement.textContent = 'Generating presentation...';
-            
-            try {
-                const controller = new AbortController();
-                const timeoutId = setTimeout(() => controller.abort(), 30000); // 30s timeout
-                
-                const res = await fetch('/suggest_subtopics', {
-                    method: 'POST',
-                    headers: { 'Content-Type': 'application/json' },
-                    body: JSON.stringify({ topic: topic.trim() }),
-                    signal: controller.signal
-                });
-                
-                clearTimeout(timeoutId);
-                
-                if (!res.ok) {
-                    const err = await res.json();
-                    throw new Error(err.error?.message || `Server error: ${res.status}`);
-                }
-                
-                const data = await res.json();
-                
-                if (!data.subtopics || !Array.isArray(data.subtopics)) {
-                    throw new Error('Invalid response format');
-                }
-                
-                // Successful navigation
-                window.location.href = `/manage_presentation?topic=${encodeURIComponent(topic)}&subtopics=${data.subtopics.map(st => encodeURIComponent(st)).join(',')}`;
-                
-            } catch (error) {
-                console.error('Submission error:', error);
-                
-                let errorMessage = 'Failed to generate presentation. ';
-                if (error.name === 'AbortError') {
-                    errorMessage += 'Request timed out. Please try again.';
-                } else if (error.message.includes('NetworkError') || error.message.includes('Failed to fetch')) {
-                    errorMessage += 'Please check your internet connection.';
-                } else {
-                    errorMessage += error.message || 'Please try again.';
-                }
-                
-                alert(errorMessage);
-                
-                // Reset UI state
-                btn.disabled = false;
-                btn.innerHTML = '✨ Generate Slides ';
-                spinner.style.display = 'none';
-                statusElement.textContent = '';
-            }
-        }
-
-        // Initialize when DOM is ready
-        if (document.readyState === 'loading') {
-            document.addEventListener('DOMContentLoaded', initialize);
-        } else {
-            initialize();
-        }
-    </script>
-</body>
-</html>''')
+    return render_template('presentation/index.html')
 
 @app.route('/suggest_subtopics', methods=['POST'])
-def suggest_subtopics():
+async def suggest_subtopics():
     data = request.get_json()
     if not (main_topic := data.get('topic')): return jsonify({"error": "No topic provided"}), 400
-    prompt = f'For a presentation on "{main_topic}", suggest 6 core subtopics. Exclude "Introduction" and "Conclusion". Return as a simple comma-separated list. Example: Subtopic 1, Subtopic 2, Subtopic 3'
-    api_url = f"https://generativelanguage.googleapis.com/v1beta/models/gemini-1.5-flash-latest:generateContent?key={GEMINI_API_KEY}"
-    payload = {"contents": [{"parts": [{"text": prompt}]}], "generationConfig": {"temperature": 0.5}}
     try:
-        result = api_call_with_backoff(api_url, {'Content-Type': 'application/json'}, payload)
-        text_response = result['candidates'][0]['content']['parts'][0]['text']
-        subtopics = [st.strip() for st in text_response.strip().split(',') if st.strip()]
+        subtopics = list(await asyncio.to_thread(gemini_subtopics, main_topic))
         while len(subtopics) < 4: subtopics.append(f"More Details on {main_topic} #{len(subtopics) + 1}")
         return jsonify({"subtopics": subtopics[:8]})
     except Exception as e:
@@ -699,1048 +370,24 @@ def suggest_subtopics():
 def manage_presentation():
     topic = request.args.get('topic', 'Presentation Topic')
     subtopics = [s for s in request.args.get('subtopics', '').split(',') if s]
-    return render_template_string('''
-        <!<!DOCTYPE html>
-<html lang="en">
-<head>
-    <meta charset="UTF-8">
-    <meta name="viewport" content="width=device-width, initial-scale=1.0">
-    <title>Manage Subtopics</title>
-    <script src="https://cdn.tailwindcss.com"></script>
-    <link href="https://fonts.googleapis.com/css2?family=Inter:wght@400;600;700&display=swap" rel="stylesheet">
-    <style>
-        * {
-            box-sizing: border-box;
-        }
-
-        body { 
-            font-family: 'Inter', sans-serif; 
-            background: linear-gradient(135deg, #0f172a 0%, #1e293b 50%, #334155 100%);
-            color: #e2e8f0; 
-            min-height: 100vh;
-            margin: 0;
-            padding: 0;
-            overflow-x: hidden;
-            position: relative;
-        }
-
-        /* Background Animation Elements - Same as first page */
-        .bg-animation {
-            position: fixed;
-            top: 0;
-            left: 0;
-            width: 100%;
-            height: 100%;
-            pointer-events: none;
-            z-index: 1;
-            will-change: transform;
-        }
-
-        .floating-orb {
-            position: absolute;
-            border-radius: 50%;
-            background: radial-gradient(circle, rgba(99, 179, 237, 0.4) 0%, rgba(139, 92, 246, 0.2) 70%, transparent 100%);
-            animation: float 8s ease-in-out infinite;
-            will-change: transform;
-            backface-visibility: hidden;
-        }
-
-        .floating-orb:nth-child(1) {
-            width: clamp(60px, 8vw, 120px);
-            height: clamp(60px, 8vw, 120px);
-            top: 15%;
-            left: 10%;
-            animation-delay: 0s;
-        }
-
-        .floating-orb:nth-child(2) {
-            width: clamp(40px, 6vw, 80px);
-            height: clamp(40px, 6vw, 80px);
-            top: 60%;
-            right: 15%;
-            animation-delay: 2s;
-        }
-
-        .floating-orb:nth-child(3) {
-            width: clamp(80px, 10vw, 150px);
-            height: clamp(80px, 10vw, 150px);
-            bottom: 15%;
-            left: 20%;
-            animation-delay: 4s;
-        }
-
-        .floating-orb:nth-child(4) {
-            width: clamp(30px, 4vw, 60px);
-            height: clamp(30px, 4vw, 60px);
-            top: 30%;
-            right: 30%;
-            animation-delay: 1s;
-        }
-
-        @keyframes float {
-            0%, 100% { 
-                transform: translateY(0px) translateX(0px) scale(1); 
-                opacity: 0.6;
-            }
-            50% { 
-                transform: translateY(-15px) translateX(10px) scale(1.05); 
-                opacity: 0.8;
-            }
-        }
-
-        .grid-pattern {
-            position: fixed;
-            top: 0;
-            left: 0;
-            width: 100%;
-            height: 100%;
-            background-image: 
-                linear-gradient(rgba(99, 179, 237, 0.08) 1px, transparent 1px),
-                linear-gradient(90deg, rgba(99, 179, 237, 0.08) 1px, transparent 1px);
-            background-size: clamp(30px, 5vw, 50px) clamp(30px, 5vw, 50px);
-            animation: gridMove 25s linear infinite;
-            z-index: 1;
-            will-change: transform;
-        }
-
-        @keyframes gridMove {
-            0% { transform: translate(0, 0); }
-            100% { transform: translate(50px, 50px); }
-        }
-
-        /* Floating Particles */
-        .particle {
-            position: absolute;
-            width: clamp(2px, 0.5vw, 4px);
-            height: clamp(2px, 0.5vw, 4px);
-            background: #63b3ed;
-            border-radius: 50%;
-            animation: particleFloat 10s linear infinite;
-            opacity: 0.4;
-            will-change: transform;
-            pointer-events: none;
-        }
-
-        .particle:nth-child(odd) {
-            background: #a78bfa;
-            animation-duration: 15s;
-        }
-
-        @keyframes particleFloat {
-            0% {
-                transform: translateY(100vh) translateX(0);
-                opacity: 0;
-            }
-            10%, 90% {
-                opacity: 0.4;
-            }
-            100% {
-                transform: translateY(-10vh) translateX(50px);
-                opacity: 0;
-            }
-        }
-
-        /* Enhanced Container */
-        .main-container {
-            max-width: min(90vw, 800px);
-            margin: clamp(20px, 5vh, 50px) auto;
-            padding: clamp(1.5rem, 4vw, 2.5rem);
-            background: rgba(30, 41, 59, 0.95);
-            backdrop-filter: blur(20px);
-            border: 1px solid rgba(99, 179, 237, 0.3);
-            border-radius: clamp(1rem, 2vw, 1.5rem);
-            box-shadow: 
-                0 25px 50px -12px rgba(0, 0, 0, 0.6),
-                0 0 0 1px rgba(99, 179, 237, 0.1),
-                inset 0 1px 0 rgba(255, 255, 255, 0.1);
-            position: relative;
-            z-index: 10;
-            transition: transform 0.3s cubic-bezier(0.4, 0, 0.2, 1);
-        }
-
-        @media (hover: hover) {
-            .main-container:hover {
-                transform: translateY(-3px);
-            }
-        }
-
-        /* Enhanced Title */
-        .title-glow {
-            background: linear-gradient(135deg, #63b3ed, #a78bfa, #f093fb);
-            background-size: 200% 200%;
-            -webkit-background-clip: text;
-            -webkit-text-fill-color: transparent;
-            background-clip: text;
-            animation: gradientShift 4s ease infinite;
-            font-size: clamp(1.5rem, 5vw, 2rem);
-            line-height: 1.2;
-            margin-bottom: clamp(1rem, 3vw, 1.5rem);
-        }
-
-        @keyframes gradientShift {
-            0%, 100% { background-position: 0% 50%; }
-            50% { background-position: 100% 50%; }
-        }
-
-        /* Subtitle styling */
-        .subtitle {
-            font-size: clamp(0.875rem, 2.5vw, 1rem);
-            line-height: 1.6;
-            margin-bottom: clamp(1.5rem, 4vw, 2rem);
-            color: #94a3b8;
-        }
-
-        /* Enhanced Subtopic List */
-        #subtopicList {
-            margin-bottom: clamp(1.5rem, 4vw, 2rem);
-            space-y: clamp(0.75rem, 2vw, 1rem);
-        }
-
-        #subtopicList li {
-            display: flex;
-            align-items: center;
-            padding: clamp(0.75rem, 3vw, 1rem);
-            margin: clamp(0.5rem, 2vw, 0.75rem) 0;
-            border-radius: clamp(0.5rem, 2vw, 0.75rem);
-            background: rgba(51, 65, 85, 0.8);
-            backdrop-filter: blur(10px);
-            border: 1px solid rgba(71, 85, 105, 0.4);
-            box-shadow: 0 4px 15px rgba(0, 0, 0, 0.2);
-            cursor: grab;
-            transition: all 0.3s cubic-bezier(0.4, 0, 0.2, 1);
-            position: relative;
-            overflow: hidden;
-        }
-
-        #subtopicList li::before {
-            content: '';
-            position: absolute;
-            left: 0;
-            top: 0;
-            height: 100%;
-            width: 3px;
-            background: linear-gradient(135deg, #63b3ed, #a78bfa);
-            transition: width 0.3s ease;
-        }
-
-        @media (hover: hover) {
-            #subtopicList li:hover {
-                transform: translateX(5px);
-                border-color: rgba(99, 179, 237, 0.5);
-                box-shadow: 0 8px 25px rgba(99, 179, 237, 0.15);
-            }
-
-            #subtopicList li:hover::before {
-                width: 5px;
-            }
-        }
-
-        #subtopicList li:active {
-            cursor: grabbing;
-        }
-
-        #subtopicList li.opacity-50 {
-            opacity: 0.5;
-            transform: rotate(2deg) scale(0.98);
-        }
-
-        /* Enhanced number styling */
-        #subtopicList li span {
-            color: #94a3b8;
-            margin-right: clamp(0.75rem, 3vw, 1rem);
-            font-weight: 600;
-            font-size: clamp(0.875rem, 2.5vw, 1rem);
-            min-width: clamp(1.5rem, 4vw, 2rem);
-            text-align: center;
-            background: rgba(99, 179, 237, 0.1);
-            border-radius: 50%;
-            width: clamp(1.5rem, 4vw, 2rem);
-            height: clamp(1.5rem, 4vw, 2rem);
-            display: flex;
-            align-items: center;
-            justify-content: center;
-        }
-
-        /* Enhanced input styling */
-        #subtopicList li input {
-            background: transparent;
-            flex-grow: 1;
-            outline: none;
-            width: 100%;
-            color: #e2e8f0;
-            font-size: clamp(0.875rem, 2.5vw, 1rem);
-            border: none;
-            padding: clamp(0.25rem, 1vw, 0.5rem);
-            border-radius: 0.25rem;
-            transition: background-color 0.2s ease;
-        }
-
-        #subtopicList li input:focus {
-            background: rgba(99, 179, 237, 0.1);
-        }
-
-        /* Enhanced delete button */
-        #subtopicList li button {
-            background: linear-gradient(135deg, #ef4444, #dc2626);
-            color: white;
-            font-weight: bold;
-            width: clamp(1.75rem, 4vw, 2rem);
-            height: clamp(1.75rem, 4vw, 2rem);
-            border-radius: 50%;
-            margin-left: clamp(0.75rem, 3vw, 1rem);
-            border: none;
-            cursor: pointer;
-            transition: all 0.3s cubic-bezier(0.4, 0, 0.2, 1);
-            display: flex;
-            align-items: center;
-            justify-content: center;
-            font-size: clamp(0.75rem, 2vw, 0.875rem);
-            box-shadow: 0 2px 8px rgba(239, 68, 68, 0.3);
-        }
-
-        @media (hover: hover) {
-            #subtopicList li button:hover {
-                background: linear-gradient(135deg, #dc2626, #b91c1c);
-                transform: scale(1.1);
-                box-shadow: 0 4px 15px rgba(239, 68, 68, 0.4);
-            }
-        }
-
-        /* Enhanced add section */
-        .add-section {
-            display: flex;
-            align-items: center;
-            gap: clamp(0.75rem, 3vw, 1rem);
-            margin-top: clamp(1.5rem, 4vw, 2rem);
-            flex-wrap: wrap;
-        }
-
-        #newSubtopicInput {
-            flex-grow: 1;
-            min-width: 200px;
-            background: rgba(51, 65, 85, 0.9);
-            backdrop-filter: blur(10px);
-            padding: clamp(0.75rem, 3vw, 1rem);
-            border-radius: clamp(0.5rem, 2vw, 0.75rem);
-            border: 2px solid rgba(71, 85, 105, 0.4);
-            color: #e2e8f0;
-            font-size: clamp(0.875rem, 2.5vw, 1rem);
-            transition: all 0.3s cubic-bezier(0.4, 0, 0.2, 1);
-            outline: none;
-        }
-
-        #newSubtopicInput:focus {
-            border-color: #63b3ed;
-            box-shadow: 0 0 0 3px rgba(99, 179, 237, 0.25);
-            transform: translateY(-1px);
-        }
-
-        .add-button {
-            background: linear-gradient(135deg, #10b981, #059669);
-            color: white;
-            font-weight: 600;
-            padding: clamp(0.75rem, 3vw, 1rem) clamp(1.25rem, 4vw, 1.5rem);
-            border-radius: clamp(0.5rem, 2vw, 0.75rem);
-            border: none;
-            cursor: pointer;
-            transition: all 0.3s cubic-bezier(0.4, 0, 0.2, 1);
-            font-size: clamp(0.875rem, 2.5vw, 1rem);
-            box-shadow: 0 4px 15px rgba(16, 185, 129, 0.3);
-            min-height: 48px;
-            display: flex;
-            align-items: center;
-            white-space: nowrap;
-        }
-
-        @media (hover: hover) {
-            .add-button:hover {
-                background: linear-gradient(135deg, #059669, #047857);
-                transform: translateY(-2px);
-                box-shadow: 0 8px 25px rgba(16, 185, 129, 0.4);
-            }
-        }
-
-        /* Enhanced final button */
-        .final-button-section {
-            text-align: center;
-            margin-top: clamp(2rem, 6vw, 3rem);
-        }
-
-        #generateFinalBtn {
-            background: linear-gradient(135deg, #2563eb, #1d4ed8);
-            color: white;
-            font-weight: bold;
-            padding: clamp(0.75rem, 3vw, 1rem) clamp(1.5rem, 5vw, 2rem);
-            border-radius: clamp(0.75rem, 2vw, 1rem);
-            border: none;
-            cursor: pointer;
-            transition: all 0.3s cubic-bezier(0.4, 0, 0.2, 1);
-            font-size: clamp(1rem, 3vw, 1.125rem);
-            box-shadow: 0 8px 25px rgba(37, 99, 235, 0.3);
-            position: relative;
-            overflow: hidden;
-            min-height: 48px;
-            display: inline-flex;
-            align-items: center;
-            justify-content: center;
-        }
-
-        #generateFinalBtn::before {
-            content: '';
-            position: absolute;
-            top: 0;
-            left: -100%;
-            width: 100%;
-            height: 100%;
-            background: linear-gradient(90deg, transparent, rgba(255, 255, 255, 0.3), transparent);
-            transition: left 0.5s ease;
-        }
-
-        @media (hover: hover) {
-            #generateFinalBtn:hover::before {
-                left: 100%;
-            }
-
-            #generateFinalBtn:hover {
-                background: linear-gradient(135deg, #1d4ed8, #1e40af);
-                transform: translateY(-3px);
-                box-shadow: 0 12px 35px rgba(37, 99, 235, 0.4);
-            }
-        }
-
-        /* Enhanced loading spinner */
-        #loadingSpinner {
-            border: 4px solid rgba(37, 99, 235, 0.3);
-            border-top: 4px solid #2563eb;
-            border-radius: 50%;
-            width: clamp(28px, 5vw, 32px);
-            height: clamp(28px, 5vw, 32px);
-            animation: spin 1s linear infinite;
-            margin: clamp(1rem, 3vw, 1.5rem) auto 0;
-            filter: drop-shadow(0 0 10px rgba(37, 99, 235, 0.5));
-        }
-
-        @keyframes spin {
-            to { transform: rotate(360deg); }
-        }
-
-        /* Fade-in animation */
-        .fade-in {
-            animation: fadeIn 0.8s cubic-bezier(0.4, 0, 0.2, 1) forwards;
-            opacity: 0;
-        }
-
-        @keyframes fadeIn {
-            from { 
-                opacity: 0; 
-                transform: translateY(20px);
-            }
-            to { 
-                opacity: 1; 
-                transform: translateY(0);
-            }
-        }
-
-        /* Responsive adjustments */
-        @media (max-width: 640px) {
-            .floating-orb {
-                animation-duration: 12s;
-            }
-            
-            .grid-pattern {
-                animation-duration: 30s;
-                opacity: 0.5;
-            }
-            
-            .particle {
-                display: none;
-            }
-
-            .add-section {
-                flex-direction: column;
-                align-items: stretch;
-            }
-
-            #newSubtopicInput {
-                min-width: auto;
-            }
-        }
-
-        @media (max-width: 480px) {
-            .main-container {
-                margin: 10px;
-                width: calc(100vw - 20px);
-            }
-        }
-
-        /* Accessibility */
-        @media (prefers-reduced-motion: reduce) {
-            .floating-orb,
-            .grid-pattern,
-            .particle,
-            .title-glow {
-                animation: none;
-            }
-            
-            .main-container:hover {
-                transform: none;
-            }
-            
-            button:hover {
-                transform: none;
-            }
-        }
-
-        @media (prefers-contrast: high) {
-            .main-container {
-                border: 2px solid #63b3ed;
-                background: rgba(15, 23, 42, 0.95);
-            }
-            
-            #subtopicList li {
-                border: 2px solid #63b3ed;
-            }
-        }
-    </style>
-</head>
-<body class="p-4 md:p-8">
-    <!-- Background Animation Elements -->
-    <div class="bg-animation">
-        <div class="grid-pattern"></div>
-        <div class="floating-orb"></div>
-        <div class="floating-orb"></div>
-        <div class="floating-orb"></div>
-        <div class="floating-orb"></div>
-    </div>
-
-    <!-- Floating Particles -->
-    <div id="particles" aria-hidden="true"></div>
-
-    <div class="main-container fade-in">
-        <h1 class="title-glow font-bold text-center">✏️ Review Your Subtopics</h1>
-        <p class="text-center subtitle">Drag to reorder, edit, add, or delete subtopics before generating the final presentation.</p>
-        
-        <ul id="subtopicList" class="mb-6 space-y-3"></ul>
-        
-        <div class="add-section">
-            <input type="text" id="newSubtopicInput" placeholder="Add a new subtopic" autocomplete="off">
-            <button onclick="addSubtopic()" class="add-button">Add</button>
-        </div>
-        
-        <div class="final-button-section">
-            <button id="generateFinalBtn" onclick="generateFinalPresentation()">✨ Create Presentation </button>
-            <div id="loadingSpinner" style="display:none;"></div>
-        </div>
-    </div>
-
-    <script>
-        // Performance optimized particle creation
-        function createParticles() {
-            const particlesContainer = document.getElementById('particles');
-            const isMobile = window.innerWidth < 640;
-            const particleCount = isMobile ? 5 : 10;
-            
-            for (let i = 0; i < particleCount; i++) {
-                const particle = document.createElement('div');
-                particle.className = 'particle';
-                particle.style.left = Math.random() * 100 + '%';
-                particle.style.animationDelay = Math.random() * 10 + 's';
-                particle.style.animationDuration = (10 + Math.random() * 10) + 's';
-                particlesContainer.appendChild(particle);
-            }
-        }
-
-        // Initialize particles
-        function initialize() {
-            try {
-                createParticles();
-            } catch (error) {
-                console.warn('Non-critical initialization error:', error);
-            }
-        }
-
-        // Initialize when DOM is ready
-        if (document.readyState === 'loading') {
-            document.addEventListener('DOMContentLoaded', initialize);
-        } else {
-            initialize();
-        }
-
-        // Original JavaScript - UNCHANGED
-        let subtopics = {{ subtopics | tojson | safe }};
-        const mainTopic = "{{ topic }}";
-        const list = document.getElementById('subtopicList');
-        
-        function renderSubtopics() {
-            list.innerHTML = subtopics.map((st, i) => `
-                <li class="flex items-center p-3 my-2 rounded-lg bg-slate-700 shadow-md cursor-grab" draggable="true" data-index="${i}">
-                    <span class="text-slate-400 mr-4">${i + 1}.</span>
-                    <input value="${st.replace(/"/g, '&quot;')}" onchange="updateSubtopic(${i}, this.value)" class="bg-transparent flex-grow focus:outline-none w-full">
-                    <button onclick="deleteSubtopic(${i})" class="bg-red-500 text-white font-bold w-8 h-8 rounded-full ml-4 hover:bg-red-600 transition-colors">X</button>
-                </li>`).join('');
-            addDragAndDropHandlers();
-        }
-        
-        function updateSubtopic(index, value) { subtopics[index] = value; }
-        function deleteSubtopic(index) { subtopics.splice(index, 1); renderSubtopics(); }
-        function addSubtopic() { 
-            const input = document.getElementById('newSubtopicInput'); 
-            if (input.value.trim()) { subtopics.push(input.value.trim()); input.value = ''; renderSubtopics(); } 
-        }
-
-        function addDragAndDropHandlers() {
-            let draggedItem = null;
-            list.querySelectorAll('li').forEach(item => {
-                item.addEventListener('dragstart', (e) => {
-                    draggedItem = e.target;
-                    setTimeout(() => e.target.classList.add('opacity-50'), 0);
-                });
-                item.addEventListener('dragend', (e) => {
-                    e.target.classList.remove('opacity-50');
-                    const newSubtopics = Array.from(list.querySelectorAll('li')).map(li => li.querySelector('input').value);
-                    subtopics = newSubtopics;
-                });
-                item.addEventListener('dragover', (e) => {
-                    e.preventDefault();
-                    const afterElement = getDragAfterElement(list, e.clientY);
-                    list.insertBefore(draggedItem, afterElement);
-                });
-            });
-        }
-        
-        function getDragAfterElement(container, y) {
-            const draggableElements = [...container.querySelectorAll('li:not(.opacity-50)')];
-            return draggableElements.reduce((closest, child) => {
-                const box = child.getBoundingClientRect();
-                const offset = y - box.top - box.height / 2;
-                if (offset < 0 && offset > closest.offset) { return { offset: offset, element: child }; } 
-                else { return closest; }
-            }, { offset: Number.NEGATIVE_INFINITY }).element;
-        }
-
-        async function generateFinalPresentation() {
-            const btn = document.getElementById('generateFinalBtn'), spinner = document.getElementById('loadingSpinner');
-            btn.style.display = 'none'; spinner.style.display = 'block';
-            try { 
-                const res = await fetch('/generate_final_presentation', { method: 'POST', headers: {'Content-Type': 'application/json'}, body: JSON.stringify({ topic: mainTopic, subtopics: subtopics }) }); 
-                if (!res.ok) throw new Error('Server error generating presentation.');
-                const presentationData = await res.json();
-                localStorage.setItem('presentationData', JSON.stringify(presentationData));
-                window.location.href = '/present';
-            } catch (err) { 
-                alert('Failed to generate presentation: ' + err); 
-                btn.style.display = 'block'; 
-                spinner.style.display = 'none'; 
-            }
-        }
-        renderSubtopics();
-    </script>
-</body>
-</html>''', topic=topic, subtopics=subtopics)
+    return render_template('presentation/manage_presentation.html', topic=topic, subtopics=subtopics)
 
 @app.route('/images/<path:filename>')
 def serve_image(filename):
-    return send_from_directory(IMAGES_DIR, filename)
+    # Slide images are content-addressed, so browsers can keep them for a year without revalidating
+    response = send_from_directory(IMAGES_DIR, filename, max_age=31536000, conditional=True)
+    response.cache_control.immutable = True
+    return response
 
 @app.route('/present')
 def present():
-    return render_template_string('''
-        <!DOCTYPE html>
-        <html lang="en">
-        <head>
-            <meta charset="UTF-8">
-            <meta name="viewport" content="width=device-width, initial-scale=1.0">
-            <title>Presentation Editor</title>
-            <script src="https://cdn.tailwindcss.com"></script>
-            <script src="https://cdn.jsdelivr.net/npm/interactjs/dist/interact.min.js"></script>
-            <script src="https://cdnjs.cloudflare.com/ajax/libs/jspdf/2.5.1/jspdf.umd.min.js"></script>
-            <script src="https://cdnjs.cloudflare.com/ajax/libs/html2canvas/1.4.1/html2canvas.min.js"></script>
-            <link href="https://fonts.googleapis.com/css2?family=Inter:wght@400;700&family=Lexend+Deca:wght@400;700&family=Roboto+Mono&family=Lora&family=Poppins&display=swap" rel="stylesheet">
-            <style>
-                :root { --primary-bg: #0f172a; --secondary-bg: #1e293b; --text: #e2e8f0; --accent: #38bdf8; --font-family: 'Inter', sans-serif; --title-font-size: 60px; --body-font-size: 28px; }
-                body { background-color: var(--primary-bg); color: var(--text); font-family: var(--font-family); }
-                .slide { width: 100%; height: 100%; position: absolute; top: 0; left: 0; display: none; background-color: var(--secondary-bg); color: var(--text); overflow: hidden; }
-                .slide.active { display: block; }
-                .draggable { position: absolute; border: 2px dashed transparent; transition: border-color 0.2s; touch-action: none; box-sizing: border-box; }
-                .draggable.selected, .draggable:hover { border-color: var(--accent); }
-                .draggable .resizer-handle { width: 12px; height: 12px; background: var(--accent); border: 2px solid white; border-radius: 50%; position: absolute; right: -6px; bottom: -6px; cursor: se-resize; z-index: 10; }
-                .draggable .delete-btn { position: absolute; top: -12px; left: -12px; width: 24px; height: 24px; background: #ef4444; color: white; border-radius: 50%; border: 2px solid white; cursor: pointer; display: none; align-items: center; justify-content: center; font-weight: bold; z-index: 20; }
-                .draggable.selected .delete-btn, .draggable:hover .delete-btn { display: flex; }
-                .draggable div[contenteditable] { outline: none; width: 100%; height: 100%; }
-                .draggable div[contenteditable] ul { list-style: disc; padding-left: 2rem; text-align: left; }
-                .draggable div[contenteditable] li { margin-bottom: 0.75rem; }
-                .customization-panel { transition: transform 0.3s ease-in-out; }
-                .customization-panel.hidden { transform: translateX(100%); }
-                .slide.bg-grid { background-image: linear-gradient(rgba(255,255,255,0.05) 1px, transparent 1px), linear-gradient(90deg, rgba(255,255,255,0.05) 1px, transparent 1px); background-size: 50px 50px; }
-                .slide.bg-shapes::before, .slide.bg-shapes::after { content: ''; position: absolute; border-radius: 9999px; z-index: 0; opacity: 0.1; animation: float 20s infinite alternate ease-in-out; }
-                .slide.bg-shapes::before { width: 200px; height: 200px; top: 10%; left: 15%; background: var(--accent); }
-                .slide.bg-shapes::after { width: 150px; height: 150px; bottom: 10%; right: 15%; background: #f472b6; animation-delay: 5s; }
-                @keyframes float { 0% { transform: translateY(0px) rotate(0deg) scale(1); } 100% { transform: translateY(40px) rotate(20deg) scale(1.1); } }
-            </style>
-        </head>
-        <body class="w-screen h-screen overflow-hidden">
-            <div id="top-bar" class="fixed top-0 left-0 right-0 bg-slate-900/80 backdrop-blur-sm p-2 flex items-center justify-between z-30 shadow-lg">
-                <div class="flex items-center gap-2">
-                    <button id="addTextBtn" title="Add Text Box" class="bg-green-500 text-white font-bold p-2 rounded-lg hover:bg-green-600"> T+ </button>
-                    <button id="addImageBtn" title="Add Image" class="bg-green-500 text-white font-bold p-2 rounded-lg hover:bg-green-600"> 🖼️ </button>
-                    <input type="file" id="imageUpload" class="hidden" accept="image/*">
-                </div>
-                <div class="flex items-center gap-3">
-                    <button id="prevBtn" class="bg-slate-700 p-2 rounded-md text-white hover:bg-slate-600 disabled:opacity-50">&lt; Prev</button>
-                    <span id="slideIndicator" class="text-white font-mono">1 / 1</span>
-                    <button id="nextBtn" class="bg-slate-700 p-2 rounded-md text-white hover:bg-slate-600">Next &gt;</button>
-                </div>
-                <div class="flex items-center gap-4">
-                    <button id="downloadPdfBtn" class="bg-blue-600 text-white font-bold py-2 px-4 rounded-lg hover:bg-blue-700">Download PDF</button>
-                    <button id="toggleCustomization" class="bg-purple-600 text-white p-2 rounded-lg hover:bg-purple-700">🎨</button>
-                </div>
-            </div>
-
-            <div id="customization-panel" class="customization-panel hidden fixed top-0 right-0 h-full bg-slate-800/90 backdrop-blur-lg p-6 shadow-2xl z-20 w-80 overflow-y-auto text-white">
-                <h3 class="text-xl font-bold text-center mb-6">Customize Design</h3>
-                <div class="space-y-4">
-                    <div><label class="font-semibold block mb-1">Background Color</label><input type="color" id="bgColor" class="w-full h-10 p-1 bg-slate-700 rounded-md cursor-pointer"></div>
-                    <div><label class="font-semibold block mb-1">Default Text Color</label><input type="color" id="textColor" class="w-full h-10 p-1 bg-slate-700 rounded-md cursor-pointer"></div>
-                    <div><label class="font-semibold block mb-1">Accent/Title Color</label><input type="color" id="accentColor" class="w-full h-10 p-1 bg-slate-700 rounded-md cursor-pointer"></div>
-                    <div><label class="font-semibold block mb-1">Font Family</label><select id="fontFamily" class="w-full bg-slate-700 p-2 rounded-md">
-                        <option value="'Inter', sans-serif">Inter (Sans-serif)</option>
-                        <option value="'Lexend Deca', sans-serif">Lexend Deca (Display)</option>
-                        <option value="'Lora', serif">Lora (Serif)</option>
-                        <option value="'Poppins', sans-serif">Poppins (Modern Sans)</option>
-                        <option value="'Roboto Mono', monospace">Roboto Mono (Monospace)</option>
-                    </select></div>
-                    <div><label class="font-semibold block mb-1">Title Font Size: <span id="titleFsValue">60</span>px</label><input type="range" id="titleFontSize" min="30" max="100" step="1" class="w-full"></div>
-                    <div><label class="font-semibold block mb-1">Body Font Size: <span id="bodyFsValue">28</span>px</label><input type="range" id="bodyFontSize" min="16" max="50" step="1" class="w-full"></div>
-                    <div><label class="font-semibold block mb-1">Background Style</label><select id="backgroundStyle" class="w-full bg-slate-700 p-2 rounded-md">
-                        <option value="none">None</option>
-                        <option value="grid">Subtle Grid</option>
-                        <option value="shapes">Floating Shapes</option>
-                    </select></div>
-                </div>
-            </div>
-            
-            <div id="delete-confirm-modal" class="fixed inset-0 bg-black/60 items-center justify-center z-50 hidden">
-                <div class="bg-slate-800 p-6 rounded-lg shadow-xl text-center">
-                    <p class="text-lg mb-4">Are you sure you want to delete this element?</p>
-                    <div class="flex justify-center gap-4">
-                        <button id="confirm-delete-btn" class="bg-red-600 text-white px-4 py-2 rounded-lg">Yes, Delete</button>
-                        <button id="cancel-delete-btn" class="bg-slate-600 text-white px-4 py-2 rounded-lg">Cancel</button>
-                    </div>
-                </div>
-            </div>
-
-            <main id="presentation-container" class="w-full h-full pt-12 relative"></main>
-
-            <script>
-                let presentation, currentSlideIndex = 0;
+    return render_template('presentation/present.html')
 
-                document.addEventListener('DOMContentLoaded', () => {
-                    const storedData = localStorage.getItem('presentationData');
-                    if (storedData) {
-                        presentation = JSON.parse(storedData);
-                        if (!presentation.theme) {
-                            presentation.theme = {
-                                bgColor: '#1e293b', textColor: '#e2e8f0', accentColor: '#38bdf8', fontFamily: "'Inter', sans-serif",
-                                titleFontSize: '60', bodyFontSize: '28', backgroundStyle: 'none'
-                            };
-                        }
-                    } else {
-                        presentation = { topic: "New Presentation", theme: { bgColor: '#1e293b', textColor: '#e2e8f0', accentColor: '#38bdf8', fontFamily: "'Inter', sans-serif", titleFontSize: '60', bodyFontSize: '28', backgroundStyle: 'none' }, slides: [{ title: "Title Slide", elements: [] }] };
-                    }
-                    
-                    setupEventListeners();
-                    applyTheme();
-                    renderCurrentSlide();
-                    updateNav();
-                    updateCustomizationPanel();
-                });
 
-                function setupEventListeners() {
-                    document.getElementById('prevBtn').addEventListener('click', prevSlide);
-                    document.getElementById('nextBtn').addEventListener('click', nextSlide);
-                    document.getElementById('addTextBtn').addEventListener('click', addTextElement);
-                    document.getElementById('addImageBtn').addEventListener('click', () => document.getElementById('imageUpload').click());
-                    document.getElementById('imageUpload').addEventListener('change', addImageElement);
-                    document.getElementById('downloadPdfBtn').addEventListener('click', downloadPDF);
-                    document.getElementById('toggleCustomization').addEventListener('click', () => {
-                        document.getElementById('customization-panel').classList.toggle('hidden');
-                    });
-                    document.getElementById('customization-panel').addEventListener('input', handleThemeChange);
-                }
-
-                function handleThemeChange(e) {
-                    const theme = presentation.theme;
-                    if (e.target.id === 'bgColor') theme.bgColor = e.target.value;
-                    if (e.target.id === 'textColor') theme.textColor = e.target.value;
-                    if (e.target.id === 'accentColor') theme.accentColor = e.target.value;
-                    if (e.target.id === 'fontFamily') theme.fontFamily = e.target.value;
-                    if (e.target.id === 'titleFontSize') {
-                        theme.titleFontSize = e.target.value;
-                        document.getElementById('titleFsValue').textContent = e.target.value;
-                    }
-                    if (e.target.id === 'bodyFontSize') {
-                        theme.bodyFontSize = e.target.value;
-                        document.getElementById('bodyFsValue').textContent = e.target.value;
-                    }
-                    if (e.target.id === 'backgroundStyle') {
-                        theme.backgroundStyle = e.target.value;
-                    }
-                    saveAndApplyTheme();
-                }
-                
-                function saveAndApplyTheme() {
-                    localStorage.setItem('presentationData', JSON.stringify(presentation));
-                    applyTheme();
-                }
-
-                function applyTheme() {
-                    const root = document.documentElement;
-                    const theme = presentation.theme;
-                    root.style.setProperty('--primary-bg', theme.bgColor);
-                    root.style.setProperty('--secondary-bg', theme.bgColor);
-                    root.style.setProperty('--text', theme.textColor);
-                    root.style.setProperty('--accent', theme.accentColor);
-                    root.style.setProperty('--font-family', theme.fontFamily);
-                    root.style.setProperty('--title-font-size', theme.titleFontSize + 'px');
-                    root.style.setProperty('--body-font-size', theme.bodyFontSize + 'px');
-                    renderCurrentSlide();
-                }
-
-                function updateCustomizationPanel() {
-                    const theme = presentation.theme;
-                    document.getElementById('bgColor').value = theme.bgColor;
-                    document.getElementById('textColor').value = theme.textColor;
-                    document.getElementById('accentColor').value = theme.accentColor;
-                    document.getElementById('fontFamily').value = theme.fontFamily;
-                    document.getElementById('titleFontSize').value = theme.titleFontSize;
-                    document.getElementById('bodyFontSize').value = theme.bodyFontSize;
-                    document.getElementById('titleFsValue').textContent = theme.titleFontSize;
-                    document.getElementById('bodyFsValue').textContent = theme.bodyFontSize;
-                    document.getElementById('backgroundStyle').value = theme.backgroundStyle || 'none';
-                }
-
-                function renderCurrentSlide() {
-                    const container = document.getElementById('presentation-container');
-                    container.innerHTML = ''; 
-                    const slideData = presentation.slides[currentSlideIndex];
-                    const slideEl = document.createElement('div');
-                    slideEl.className = 'slide active';
-                    slideEl.id = `slide-${currentSlideIndex}`;
-                    
-                    slideEl.classList.remove('bg-grid', 'bg-shapes');
-                    if(presentation.theme.backgroundStyle && presentation.theme.backgroundStyle !== 'none') {
-                        slideEl.classList.add(`bg-${presentation.theme.backgroundStyle}`);
-                    }
-                    
-                    container.appendChild(slideEl);
-
-                    slideData.elements.forEach((element, index) => {
-                        const el = createDraggableElement(element, index);
-                        slideEl.appendChild(el);
-                    });
-                }
-                
-                function createDraggableElement(elementData, index) {
-                    const el = document.createElement('div');
-                    el.className = 'draggable';
-                    el.id = `element-${currentSlideIndex}-${index}`;
-                    el.style.left = elementData.x;
-                    el.style.top = elementData.y;
-                    el.style.width = elementData.width;
-                    el.style.height = elementData.height;
-                    el.dataset.x = 0;
-                    el.dataset.y = 0;
-                    
-                    let innerHTML = '';
-                    if (elementData.type === 'text') {
-                        el.style.color = elementData.isTitle ? 'var(--accent)' : 'var(--text)';
-                        el.style.fontSize = elementData.isTitle ? 'var(--title-font-size)' : 'var(--body-font-size)';
-                        el.style.fontFamily = elementData.isTitle ? "'Lexend Deca', sans-serif" : 'inherit';
-                        el.style.textAlign = elementData.isTitle ? 'center' : 'left';
-                        innerHTML = `<div contenteditable="true" class="w-full h-full">${elementData.content}</div>`;
-                    } else if (elementData.type === 'image') {
-                        innerHTML = `<img src="${elementData.src}" class="w-full h-full object-cover">`;
-                    }
-                    
-                    el.innerHTML = `<button class="delete-btn">X</button>${innerHTML}<div class="resizer-handle"></div>`;
-                    
-                    el.querySelector('.delete-btn').addEventListener('click', (e) => {
-                        e.stopPropagation();
-                        deleteElement(index);
-                    });
-                    
-                    const contentDiv = el.querySelector('[contenteditable]');
-                    if (contentDiv) {
-                        contentDiv.addEventListener('blur', () => {
-                            updateElementContent(el);
-                        });
-                    }
-
-                    el.addEventListener('click', () => {
-                         document.querySelectorAll('.draggable').forEach(d => d.classList.remove('selected'));
-                         el.classList.add('selected');
-                    });
-
-                    interact(el)
-                        .draggable({ listeners: { move: dragMoveListener }, onend: updateElementPositionAndSize })
-                        .resizable({
-                            edges: { left: true, right: true, bottom: true, top: true },
-                            listeners: { move: resizeListener },
-                            onend: updateElementPositionAndSize
-                        });
-                    return el;
-                }
-                
-                function deleteElement(elementIndex) {
-                    const modal = document.getElementById('delete-confirm-modal');
-                    modal.style.display = 'flex';
-
-                    const confirmBtn = document.getElementById('confirm-delete-btn');
-                    const cancelBtn = document.getElementById('cancel-delete-btn');
-
-                    const confirmHandler = () => {
-                        presentation.slides[currentSlideIndex].elements.splice(elementIndex, 1);
-                        renderCurrentSlide();
-                        localStorage.setItem('presentationData', JSON.stringify(presentation));
-                        closeModal();
-                    };
-                    
-                    const closeModal = () => {
-                        modal.style.display = 'none';
-                        confirmBtn.removeEventListener('click', confirmHandler);
-                        cancelBtn.removeEventListener('click', closeModal);
-                    };
-
-                    confirmBtn.addEventListener('click', confirmHandler, { once: true });
-                    cancelBtn.addEventListener('click', closeModal, { once: true });
-                }
-
-                function dragMoveListener(event) {
-                    const target = event.target;
-                    const x = (parseFloat(target.dataset.x) || 0) + event.dx;
-                    const y = (parseFloat(target.dataset.y) || 0) + event.dy;
-                    target.style.transform = `translate(${x}px, ${y}px)`;
-                    target.dataset.x = x;
-                    target.dataset.y = y;
-                }
-
-                function resizeListener(event) {
-                    const target = event.target;
-                    let x = (parseFloat(target.dataset.x) || 0);
-                    let y = (parseFloat(target.dataset.y) || 0);
-                    target.style.width = event.rect.width + 'px';
-                    target.style.height = event.rect.height + 'px';
-                    target.style.transform = `translate(${x}px, ${y}px)`;
-                }
-                
-                function updateElementContent(target) {
-                    const [, slideIdx, elIdx] = target.id.split('-').map(Number);
-                     if(!presentation.slides[slideIdx] || !presentation.slides[slideIdx].elements[elIdx]) return;
-                    const elementData = presentation.slides[slideIdx].elements[elIdx];
-                    if (elementData.type === 'text') {
-                        elementData.content = target.querySelector('[contenteditable]').innerHTML;
-                        localStorage.setItem('presentationData', JSON.stringify(presentation));
-                    }
-                }
-
-                function updateElementPositionAndSize(event) {
-                    const target = event.target;
-                    const [, slideIdx, elIdx] = target.id.split('-').map(Number);
-                    if(!presentation.slides[slideIdx] || !presentation.slides[slideIdx].elements[elIdx]) return;
-                    
-                    const elementData = presentation.slides[slideIdx].elements[elIdx];
-                    const parentRect = target.parentElement.getBoundingClientRect();
-
-                    const newX = target.offsetLeft + (parseFloat(target.dataset.x) || 0);
-                    const newY = target.offsetTop + (parseFloat(target.dataset.y) || 0);
-
-                    elementData.x = `${(newX / parentRect.width * 100).toFixed(2)}%`;
-                    elementData.y = `${(newY / parentRect.height * 100).toFixed(2)}%`;
-                    elementData.width = `${(target.offsetWidth / parentRect.width * 100).toFixed(2)}%`;
-                    elementData.height = `${(target.offsetHeight / parentRect.height * 100).toFixed(2)}%`;
-                    
-                    if (elementData.type === 'text') {
-                        elementData.content = target.querySelector('[contenteditable]').innerHTML;
-                    }
-                    
-                    target.style.transform = '';
-                    target.dataset.x = 0;
-                    target.dataset.y = 0;
-                    target.style.left = elementData.x;
-                    target.style.top = elementData.y;
-
-                    localStorage.setItem('presentationData', JSON.stringify(presentation));
-                }
-                
-                function addTextElement() {
-                    const newText = { type: 'text', content: 'New Text', x: '5%', y: '5%', width: '30%', height: '15%', isTitle: false };
-                    presentation.slides[currentSlideIndex].elements.push(newText);
-                    renderCurrentSlide();
-                    localStorage.setItem('presentationData', JSON.stringify(presentation));
-                }
-
-                function addImageElement(event) {
-                    const file = event.target.files[0];
-                    if (!file) return;
-                    const reader = new FileReader();
-                    reader.onload = (e) => {
-                        const newImage = { type: 'image', src: e.target.result, x: '10%', y: '10%', width: '40%', height: '40%' };
-                        presentation.slides[currentSlideIndex].elements.push(newImage);
-                        renderCurrentSlide();
-                        localStorage.setItem('presentationData', JSON.stringify(presentation));
-                    };
-                    reader.readAsDataURL(file);
-                }
-                
-                function prevSlide() { if (currentSlideIndex > 0) { currentSlideIndex--; renderCurrentSlide(); updateNav(); } }
-                function nextSlide() { if (currentSlideIndex < presentation.slides.length - 1) { currentSlideIndex++; renderCurrentSlide(); updateNav(); } }
-                
-                function updateNav() {
-                    document.getElementById('slideIndicator').textContent = `${currentSlideIndex + 1} / ${presentation.slides.length}`;
-                    document.getElementById('prevBtn').disabled = currentSlideIndex === 0;
-                    document.getElementById('nextBtn').disabled = currentSlideIndex === presentation.slides.length - 1;
-                }
-
-                async function downloadPDF() {
-                    document.querySelectorAll('.draggable').forEach(d => d.classList.remove('selected'));
-                    
-                    const btn = document.getElementById('downloadPdfBtn'); btn.textContent = 'Downloading...'; btn.disabled = true;
-                    const { jsPDF } = window.jspdf; 
-                    const doc = new jsPDF({ orientation: 'l', unit: 'px', format: [1280, 720] });
-                    const originalIndex = currentSlideIndex;
-
-                    for (let i = 0; i < presentation.slides.length; i++) {
-                        currentSlideIndex = i;
-                        renderCurrentSlide();
-                        await new Promise(r => setTimeout(r, 500)); 
-                        const slideEl = document.getElementById(`slide-${i}`);
-                        const canvas = await html2canvas(slideEl, { scale: 2, backgroundColor: presentation.theme.bgColor });
-                        if (i > 0) doc.addPage([1280, 720], 'l');
-                        doc.addImage(canvas.toDataURL('image/jpeg', 0.9), 'JPEG', 0, 0, 1280, 720);
-                    }
-                    
-                    doc.save(`${presentation.topic.replace(/\s+/g, '_') || 'presentation'}.pdf`);
-                    currentSlideIndex = originalIndex;
-                    renderCurrentSlide();
-                    btn.textContent = 'Download PDF'; btn.disabled = false;
-                }
-            </script>
-        </body>
-        </html>
-    ''')
-
-
-@app.route('/generate_final_presentation', methods=['POST'])
-def generate_final_presentation():
-    data = request.get_json()
-    main_topic, user_subtopics = data.get('topic'), data.get('subtopics', [])
-    if not main_topic or not user_subtopics: return "Invalid request", 400
-
-    final_subtopics = ["Introduction"] + user_subtopics[:] + ["Conclusion", "Q&A"]
-    
-    prompt = f"""
-    Create a JSON object for a presentation on "{main_topic}".
-    The JSON must have a 'topic' key set to "{main_topic}" and a 'slides' array. Each object in 'slides' represents a slide and has a 'title' (short and impactful) and an 'elements' array.
+# Presentation generation prompt, filled in with the topic and the slide list per request
+PRESENTATION_PROMPT = """
+    Create a JSON object for a presentation on "{topic}".
+    The JSON must have a 'topic' key set to "{topic}" and a 'slides' array. Each object in 'slides' represents a slide and has a 'title' (short and impactful) and an 'elements' array.
     Each element in 'elements' must have these keys: 'type', 'content' (for text) or 'query' (for image), 'x', 'y', 'width', 'height' (as responsive percentages, e.g., "50%"), and 'isTitle' (boolean). The 'fontSize' key is deprecated and should NOT be included.
 
     **IMPORTANT LAYOUT RULES & CONTENT FORMATTING:**
@@ -1767,45 +414,110 @@ def generate_final_presentation():
             * `"x": "10%", "y": "40%", "width": "80%", "height": "20%"`
 
     **TASK:**
-    Generate one slide object for each of these topics: {', '.join(final_subtopics)}.
+    Generate one slide object for each of these topics: {subtopics}.
     - Use the **Two-Column Layout** for all slides EXCEPT the 'Q&A' slide.
     - Use the **Title Only Layout** for the 'Q&A' slide.
     - For each image element, provide a concise, relevant search 'query'.
 
     Return ONLY the raw, perfectly formatted JSON object. Do not include any other text or markdown.
     """
+PRESENTATION_GENERATION_CONFIG = {"temperature": 0.7, "responseMimeType": "application/json"}
+
+# --- Helper generating a presentation's slides and images, reporting progress as it goes ---
+async def build_presentation(main_topic, user_subtopics, on_progress=None):
+    final_subtopics = ["Introduction"] + user_subtopics[:] + ["Conclusion", "Q&A"]
     
-    api_url = f"https://generativelanguage.googleapis.com/v1beta/models/gemini-1.5-flash-latest:generateContent?key={GEMINI_API_KEY}"
-    payload = {
-        "contents": [{"parts": [{"text": prompt}]}],
-        "generationConfig": {"temperature": 0.7, "responseMimeType": "application/json"}
-    }
+    prompt = PRESENTATION_PROMPT.format(topic=main_topic, subtopics=', '.join(final_subtopics))
     
+    api_url = GEMINI_GENERATE_URL
+    payload = {"contents": [{"parts": [{"text": prompt}]}], "generationConfig": PRESENTATION_GENERATION_CONFIG}
+    
+    print("Generating presentation data...")
+    if on_progress:
+        on_progress('progress', {"stage": "generating"})
+    # The same topic and slide list reuses the deck Gemini wrote last time; its images still resolve below
+    cache_key = "deck:" + hashlib.sha256('|'.join([main_topic, *final_subtopics]).encode('utf-8')).hexdigest()
+    presentation_data = await asyncio.to_thread(cache.get, cache_key)
+    if presentation_data is None:
+        result = await asyncio.to_thread(api_call_with_backoff, api_url, headers={'Content-Type': 'application/json'}, payload=payload)
+        presentation_data = parse_json(result['candidates'][0]['content']['parts'][0]['text'])
+        await asyncio.to_thread(cache.set, cache_key, presentation_data)
+    
+    print("Fetching and downloading images...")
+    loop = asyncio.get_running_loop()
+    image_elements = [element for slide in presentation_data.get('slides', [])
+                      for element in slide.get('elements', [])
+                      if element.get('type') == 'image' and 'query' in element]
+    queries = [element.pop('query') for element in image_elements]
+    if on_progress:
+        on_progress('progress', {"stage": "images", "done": 0, "count": len(queries)})
+
+    # One Unsplash search for the whole topic covers most slides; the rest fall back to their own search
+    matches = await asyncio.to_thread(search_unsplash_images_batch, main_topic, queries)
+
+    async def fetch_into(element, query):
+        element['src'] = await loop.run_in_executor(IMAGE_EXECUTOR, fetch_and_save_image, query, matches.get(query))
+
+    # All slides' images are downloaded concurrently; progress is reported in the order they finish
+    for done, fetch in enumerate(asyncio.as_completed([fetch_into(element, query) for element, query in zip(image_elements, queries)]), 1):
+        await fetch
+        if on_progress:
+            on_progress('progress', {"stage": "images", "done": done, "count": len(queries)})
+
+    return presentation_data
+
+# Raised from a progress callback to abort a generation nobody is waiting for any more
+class GenerationCancelled(Exception):
+    pass
+
+# --- Helper generator streaming build_presentation progress as Server-Sent Events ---
+def presentation_event_stream(main_topic, user_subtopics):
+    events = queue.Queue()
+    cancelled = threading.Event()
+
+    def on_progress(event, data):
+        if cancelled.is_set():
+            raise GenerationCancelled()
+        events.put((event, data))
+
+    def run_pipeline():
+        try:
+            presentation_data = asyncio.run(build_presentation(main_topic, user_subtopics, on_progress))
+            events.put(('done', presentation_data))
+        except GenerationCancelled:
+            print("Client disconnected, presentation generation cancelled.")
+        except Exception as e:
+            print(f"Error during presentation generation: {e}")
+            events.put(('error', {"error": "Failed to generate presentation content."}))
+
+    threading.Thread(target=run_pipeline, daemon=True).start()
     try:
-        print("Generating presentation data...")
-        result = api_call_with_backoff(api_url, headers={'Content-Type': 'application/json'}, payload=payload)
-        presentation_data = json.loads(result['candidates'][0]['content']['parts'][0]['text'])
-        
-        print("Fetching and downloading images...")
-        for slide_idx, slide in enumerate(presentation_data.get('slides', [])):
-            for element_idx, element in enumerate(slide.get('elements', [])):
-                if element.get('type') == 'image' and 'query' in element:
-                    image_url = search_unsplash_image(element['query'])
-                    if image_url:
-                        filename = f"slide_{slide_idx}_element_{element_idx}.jpg"
-                        local_image_path = download_image(image_url, filename)
-                        element['src'] = local_image_path or "https://placehold.co/600x400/1e293b/e2e8f0?text=Image+Not+Found"
-                    else:
-                        element['src'] = "https://placehold.co/600x400/1e293b/e2e8f0?text=Image+Not+Found"
-                    
-                    if 'query' in element:
-                        del element['query']
+        while True:
+            event, data = events.get()
+            yield f"event: {event}\ndata: {dump_json(data).decode('utf-8')}\n\n"
+            if event in ('done', 'error'):
+                break
+    finally:
+        # The server closes this generator when the client goes away mid-stream
+        cancelled.set()
 
-        return jsonify(presentation_data)
+@app.route('/generate_final_presentation', methods=['POST'])
+async def generate_final_presentation():
+    data = request.get_json()
+    main_topic, user_subtopics = data.get('topic'), data.get('subtopics', [])
+    if not main_topic or not user_subtopics: return "Invalid request", 400
 
+    # Clients that accept SSE get progress while the deck is generated; others get plain JSON
+    if 'text/event-stream' in request.headers.get('Accept', ''):
+        return Response(presentation_event_stream(main_topic, user_subtopics), mimetype='text/event-stream',
+                        headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'})
+
+    try:
+        return jsonify(await build_presentation(main_topic, user_subtopics))
     except Exception as e:
         print(f"Error during presentation generation: {e}")
         return jsonify({"error": "Failed to generate presentation content."}), 500
 
+# Development server only; in production the app is served by gunicorn's gevent workers (see Procfile)
 if __name__ == '__main__':
     app.run(debug=True, port=5001)
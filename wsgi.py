@@ -0,0 +1,8 @@
+# Single WSGI entry point serving both apps from one web process (see Procfile):
+# the website generator at / and the presentation generator under /presentation.
+from werkzeug.middleware.dispatcher import DispatcherMiddleware
+
+from Complete import app as website_app
+from tempCodeRunnerFile import app as presentation_app
+
+app = DispatcherMiddleware(website_app, {'/presentation': presentation_app})